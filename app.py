@@ -1,18 +1,37 @@
+import click
 from flask import Flask
-from src.config.database import config_db
+from src.config.database import config_db, db
+from src.cache import config_cache
+from src.config.instrumentation import config_instrumentation
 from src.config.api import api
 from src.routes import register_namespaces
 
 
-def create_app():
+def create_app(profile=None, config=None):
+    """Build the app from a settings profile.
+
+    ``config`` overrides profile and environment settings, e.g.
+    ``create_app("test", {"SQLALCHEMY_DATABASE_URI": "sqlite://"})``.
+    """
     app = Flask(__name__)
 
-    config_db(app)
+    config_db(app, profile, config)
+    config_cache(app)
+    config_instrumentation(app)
 
     api.init_app(app)
 
     register_namespaces(api)
 
+    @app.cli.command("rebuild-availability")
+    def rebuild_availability():
+        """Recompute the album availability counts from inventory items"""
+        from src.models.album_availability import rebuild_album_availability
+
+        rebuild_album_availability(db.session)
+        db.session.commit()
+        click.echo("Album availability rebuilt")
+
     return app
 
 
@@ -0,0 +1,45 @@
+from contextlib import asynccontextmanager
+
+import uvicorn
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app import create_app
+from src.config.api import api
+from src.asgi import build_async_engine, build_sessionmaker, read_routes
+
+
+def create_asgi_app(profile=None, config=None):
+    """Serve the read endpoints on asyncio, everything else through Flask.
+
+    Async routes are tried first; any other request (writes, search, Swagger
+    UI and swagger.json) falls through to the Flask app, which runs on a
+    thread pool of ASGI_WSGI_THREADS threads.
+    """
+    flask_app = create_app(profile, config)
+    engine = build_async_engine(flask_app.config)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await engine.dispose()
+
+    app = Starlette(
+        routes=[
+            *read_routes(prefix=api.prefix),
+            Mount(
+                "/",
+                app=WSGIMiddleware(
+                    flask_app, workers=flask_app.config["ASGI_WSGI_THREADS"]
+                ),
+            ),
+        ],
+        lifespan=lifespan,
+    )
+    app.state.sessions = build_sessionmaker(engine)
+    return app
+
+
+if __name__ == "__main__":
+    uvicorn.run("asgi:create_asgi_app", factory=True, port=5002)
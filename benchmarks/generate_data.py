@@ -0,0 +1,554 @@
+"""Fill an empty database with a large, consistent rental history.
+
+Run from the repository root:
+
+    python -m benchmarks.generate_data --database-url postgresql://... --customers 2000000
+
+The same seed and sizes always produce the same rows, whatever the number
+of worker processes. Rows are generated in fixed-size chunks by a pool of
+processes; on PostgreSQL every worker loads its chunks with COPY, other
+databases receive them through executemany from the parent process.
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import multiprocessing
+import random
+import sys
+import time
+from datetime import date, datetime, time as day_start, timedelta
+from decimal import Decimal
+from hashlib import blake2b
+from uuid import UUID
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from src.models import (
+    Address,
+    Album,
+    Attendant,
+    Customer,
+    InventoryItem,
+    Payment,
+    Person,
+    Rental,
+    Store,
+)
+
+# Fixed so chunk boundaries, and with them the rows, never depend on the
+# number of workers
+CHUNK_SIZE = 5000
+
+FIRST_NAMES = [
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Heitor",
+    "Isabela", "Joao", "Larissa", "Lucas", "Mariana", "Mateus", "Natalia", "Otavio",
+    "Paula", "Rafael", "Sofia", "Thiago", "Valentina", "Vitor", "Yasmin", "Caio",
+]
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Pereira", "Costa", "Rodrigues",
+    "Almeida", "Nascimento", "Lima", "Araujo", "Fernandes", "Carvalho", "Gomes",
+    "Martins", "Rocha", "Ribeiro", "Alves", "Monteiro", "Barbosa", "Cardoso",
+]
+WORDS = [
+    "Blue", "Night", "Kind", "Love", "Summer", "River", "Electric", "Quiet",
+    "Golden", "Broken", "City", "Morning", "Velvet", "Paper", "Wild", "Silver",
+    "Ocean", "Dream", "Fire", "Shadow", "Light", "Road", "Heart", "Storm",
+    "Garden", "Echo", "Stone", "Moon", "Sun", "Rain", "Glass", "Sea",
+]
+GENRES = [
+    "Rock", "Pop", "Jazz", "MPB", "Samba", "Bossa Nova", "Forro", "Sertanejo",
+    "Electronic", "Hip Hop", "Blues", "Soul", "Reggae", "Classical", "Funk", "Metal",
+]
+STREETS = [
+    "Rua Pernambuco", "Avenida Bezerra De Menezes", "Rua Barao Do Rio Branco",
+    "Avenida Santos Dumont", "Rua Padre Valdevino", "Avenida Washington Soares",
+    "Rua Tiburcio Cavalcante", "Avenida Dom Luis", "Rua Carlos Vasconcelos",
+]
+NEIGHBORHOODS = [
+    "Pici", "Aldeota", "Meireles", "Benfica", "Centro", "Fatima", "Messejana",
+    "Parangaba", "Coco", "Varjota", "Papicu", "Montese",
+]
+CITIES = [
+    ("Fortaleza", "CE"), ("Recife", "PE"), ("Salvador", "BA"), ("Natal", "RN"),
+    ("Sao Paulo", "SP"), ("Rio De Janeiro", "RJ"), ("Belo Horizonte", "MG"),
+]
+# Weighted like a counter would see them
+PAYMENT_METHODS = ["pix"] * 4 + ["credit_card"] * 3 + ["debit_card"] * 2 + ["cash"]
+PAYMENT_STATUSES = ["completed"] * 93 + ["failed"] * 4 + ["refunded"] * 3
+UNAVAILABLE_STATUSES = ["maintenance", "damaged", "lost"]
+
+# 9- and 8-digit numbers made of one repeated digit, which the validators reject
+CPF_REPDIGITS = [int(str(digit) * 9) for digit in range(1, 10)]
+CPF_RANGE = 900_000_000 - len(CPF_REPDIGITS)
+CNPJ_RANGE = 90_000_000
+# Coprime with both ranges, so index -> number is a permutation
+STRIDE = 104_729
+
+
+class GenerationError(RuntimeError):
+    pass
+
+
+def _digest(seed, kind, index):
+    return blake2b(f"{seed}:{kind}:{index}".encode(), digest_size=16).digest()
+
+
+def make_id(seed, kind, index):
+    """The id of the ``index``-th row of ``kind``, computable from any process"""
+    return UUID(bytes=_digest(seed, kind, index), version=4)
+
+
+def fraction(seed, kind, index):
+    """A stable number in [0, 1) for the ``index``-th row of ``kind``"""
+    return int.from_bytes(_digest(seed, kind, index)[:8], "big") / 2**64
+
+
+def _check_digit(digits, weights):
+    remainder = sum(d * w for d, w in zip(digits, weights)) % 11
+    return 0 if remainder < 2 else 11 - remainder
+
+
+def cpf(seed, index):
+    """A unique CPF with valid check digits for person ``index``"""
+    offset = int(fraction(seed, "cpf", 0) * CPF_RANGE)
+    base = 100_000_000 + (index * STRIDE + offset) % CPF_RANGE
+    for repdigit in CPF_REPDIGITS:
+        if base >= repdigit:
+            base += 1
+
+    digits = [int(c) for c in str(base)]
+    digits.append(_check_digit(digits, range(10, 1, -1)))
+    digits.append(_check_digit(digits, range(11, 1, -1)))
+    return "".join(map(str, digits))
+
+
+def cnpj(seed, index):
+    """A unique CNPJ (head office branch 0001) with valid check digits"""
+    offset = int(fraction(seed, "cnpj", 0) * CNPJ_RANGE)
+    root = 10_000_000 + (index * STRIDE + offset) % CNPJ_RANGE
+
+    digits = [int(c) for c in f"{root}0001"]
+    weights = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    digits.append(_check_digit(digits, weights))
+    digits.append(_check_digit(digits, [6, *weights]))
+    return "".join(map(str, digits))
+
+
+def _phone(rng):
+    return f"859{rng.randrange(10**8):08d}"
+
+
+def _address(rng):
+    city, state = rng.choice(CITIES)
+    return [
+        rng.choice(STREETS),
+        str(rng.randrange(1, 4000)),
+        rng.choice(NEIGHBORHOODS),
+        city,
+        state,
+        f"{rng.randrange(10_000_000, 100_000_000)}",
+    ]
+
+
+class Plan:
+    """Sizes of the dataset and the functions deriving rows from indexes"""
+
+    def __init__(self, args):
+        self.seed = args.seed
+        self.stores = args.stores
+        self.attendants_per_store = args.attendants_per_store
+        self.customers = args.customers
+        self.albums = args.albums
+        self.copies = args.copies
+        self.rental_gap_days = args.rental_gap_days
+        self.end = datetime.combine(args.end_date, day_start())
+        self.start = self.end - timedelta(days=365 * args.years)
+
+    @property
+    def attendants(self):
+        return self.stores * self.attendants_per_store
+
+    @property
+    def items(self):
+        return self.albums * self.copies
+
+    def rng(self, kind, chunk):
+        return random.Random(f"{self.seed}:{kind}:{chunk}")
+
+    def id(self, kind, index):
+        return make_id(self.seed, kind, index)
+
+    def person(self, index, rng):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        span = int((self.end - self.start).total_seconds())
+        created = self.start + timedelta(seconds=rng.randrange(span))
+        return [
+            self.id("person", index),
+            cpf(self.seed, index),
+            f"{first} {last}",
+            _phone(rng),
+            f"{first}.{last}.{index}@example.com".lower(),
+            created,
+            created,
+        ]
+
+    def album_price(self, album):
+        cents = 490 + int(fraction(self.seed, "price", album) * 3500)
+        return Decimal(cents).scaleb(-2)
+
+    def item_store(self, item):
+        return int(fraction(self.seed, "item-store", item) * self.stores)
+
+
+TIMESTAMPS = ["created_at", "updated_at"]
+STORE_COLUMNS = ["id", "cnpj", "trade_name", *TIMESTAMPS]
+ADDRESS_COLUMNS = [
+    "id", "street", "number", "neighborhood", "city", "state", "zip_code",
+    "store_id", "customer_id", *TIMESTAMPS,
+]
+PERSON_COLUMNS = ["id", "cpf", "name", "phone", "email", *TIMESTAMPS]
+ATTENDANT_COLUMNS = ["person_id", "store_id", *TIMESTAMPS]
+CUSTOMER_COLUMNS = ["person_id", *TIMESTAMPS]
+ALBUM_COLUMNS = ["id", "title", "rental_price", "artist", "genre", *TIMESTAMPS]
+ITEM_COLUMNS = ["id", "album_id", "store_id", "status", "barcode", *TIMESTAMPS]
+RENTAL_COLUMNS = [
+    "id", "customer_id", "item_id", "attendant_id", "rental_date", "return_date",
+    *TIMESTAMPS,
+]
+PAYMENT_COLUMNS = [
+    "id", "rental_id", "amount", "payment_date", "payment_method", "status",
+    *TIMESTAMPS,
+]
+
+
+def stores_chunk(plan, start, stop):
+    """Stores with their address and attendants"""
+    rng = plan.rng("stores", start)
+    stores, addresses, persons, attendants = [], [], [], []
+    for index in range(start, stop):
+        store_id = plan.id("store", index)
+        created = plan.start
+        stores.append([
+            store_id, cnpj(plan.seed, index),
+            f"{rng.choice(WORDS)} {rng.choice(WORDS)} Discos {index + 1}",
+            created, created,
+        ])
+        addresses.append([
+            plan.id("store-address", index), *_address(rng), store_id, None,
+            created, created,
+        ])
+        for number in range(plan.attendants_per_store):
+            person = index * plan.attendants_per_store + number
+            persons.append(plan.person(person, rng))
+            attendants.append([persons[-1][0], store_id, created, created])
+
+    return [
+        (Store.__tablename__, STORE_COLUMNS, stores),
+        (Address.__tablename__, ADDRESS_COLUMNS, addresses),
+        (Person.__tablename__, PERSON_COLUMNS, persons),
+        (Attendant.__tablename__, ATTENDANT_COLUMNS, attendants),
+    ]
+
+
+def customers_chunk(plan, start, stop):
+    """Customers, each with a person row and a home address"""
+    rng = plan.rng("customers", start)
+    persons, customers, addresses = [], [], []
+    for index in range(start, stop):
+        person = plan.person(plan.attendants + index, rng)
+        persons.append(person)
+        customers.append([person[0], person[5], person[6]])
+        addresses.append([
+            plan.id("customer-address", index), *_address(rng), None, person[0],
+            person[5], person[6],
+        ])
+
+    return [
+        (Person.__tablename__, PERSON_COLUMNS, persons),
+        (Customer.__tablename__, CUSTOMER_COLUMNS, customers),
+        (Address.__tablename__, ADDRESS_COLUMNS, addresses),
+    ]
+
+
+def _artist(index):
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last = LAST_NAMES[index // len(FIRST_NAMES) % len(LAST_NAMES)]
+    return f"{first} {last} {index + 1}"
+
+
+def albums_chunk(plan, start, stop):
+    rng = plan.rng("albums", start)
+    albums = []
+    for index in range(start, stop):
+        # Long-tailed: a few artists have many albums
+        artist = int(plan.albums / 4 * rng.random() ** 3)
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        albums.append([
+            plan.id("album", index),
+            f"{' '.join(words)} {index + 1}",
+            plan.album_price(index),
+            _artist(artist),
+            rng.choice(GENRES),
+            plan.start,
+            plan.start,
+        ])
+
+    return [(Album.__tablename__, ALBUM_COLUMNS, albums)]
+
+
+def items_chunk(plan, start, stop):
+    """Inventory items with their whole rental and payment history.
+
+    Rentals of one copy follow each other in time. A rental still running
+    at the end date is left open and its item marked rented; some of them
+    started long enough ago to be overdue.
+    """
+    rng = plan.rng("items", start)
+    items, rentals, payments = [], [], []
+    for index in range(start, stop):
+        item_id = plan.id("item", index)
+        album = index // plan.copies
+        store = plan.item_store(index)
+        status = "available"
+
+        moment = plan.start
+        for number in itertools.count():
+            moment += timedelta(days=rng.expovariate(1 / plan.rental_gap_days))
+            if moment >= plan.end:
+                break
+
+            rental_id = plan.id("rental", f"{index}:{number}")
+            returned = moment + timedelta(hours=rng.randint(6, 24 * 14))
+            if returned >= plan.end:
+                returned = None
+                status = "rented"
+
+            customer = int(plan.customers * rng.random() ** 1.5)
+            attendant = store * plan.attendants_per_store + rng.randrange(
+                plan.attendants_per_store
+            )
+            rentals.append([
+                rental_id,
+                plan.id("person", plan.attendants + customer),
+                item_id,
+                plan.id("person", attendant),
+                moment,
+                returned,
+                moment,
+                returned or moment,
+            ])
+            payments.append([
+                plan.id("payment", f"{index}:{number}"),
+                rental_id,
+                plan.album_price(album),
+                moment,
+                rng.choice(PAYMENT_METHODS),
+                "pending" if returned is None else rng.choice(PAYMENT_STATUSES),
+                moment,
+                returned or moment,
+            ])
+            if returned is None:
+                break
+            moment = returned
+
+        if status == "available" and rng.random() < 0.02:
+            status = rng.choice(UNAVAILABLE_STATUSES)
+        items.append([
+            item_id, plan.id("album", album), plan.id("store", store), status,
+            f"{index + 1:013d}", plan.start, plan.start,
+        ])
+
+    return [
+        (InventoryItem.__tablename__, ITEM_COLUMNS, items),
+        (Rental.__tablename__, RENTAL_COLUMNS, rentals),
+        (Payment.__tablename__, PAYMENT_COLUMNS, payments),
+    ]
+
+
+# Loaded in this order, each phase only references rows of earlier ones
+PHASES = [
+    ("stores", stores_chunk, lambda plan: plan.stores),
+    ("albums", albums_chunk, lambda plan: plan.albums),
+    ("customers", customers_chunk, lambda plan: plan.customers),
+    ("items", items_chunk, lambda plan: plan.items),
+]
+GENERATORS = {name: build for name, build, _ in PHASES}
+
+
+def copy_rows(connection, table, columns, rows):
+    """Load ``rows`` with COPY ... FROM STDIN (PostgreSQL and psycopg2)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # None is written as an unquoted empty field, which COPY reads as NULL
+        writer.writerow(
+            value.isoformat(sep=" ") if isinstance(value, datetime) else value
+            for value in row
+        )
+    buffer.seek(0)
+
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def insert_rows(connection, table, columns, rows):
+    """Portable fallback: one executemany per table"""
+    if rows:
+        connection.execute(
+            TABLES[table].insert(), [dict(zip(columns, row)) for row in rows]
+        )
+
+
+TABLES = {
+    model.__tablename__: model.__table__
+    for model in (
+        Store, Address, Person, Attendant, Customer, Album, InventoryItem, Rental, Payment,
+    )
+}
+
+# Set in every worker by _init_worker
+_plan = None
+_engine = None
+
+
+def _init_worker(plan, url):
+    global _plan, _engine
+    _plan = plan
+    # Workers with a URL load their own chunks, over a connection of their own
+    _engine = create_engine(url) if url else None
+
+
+def _run_chunk(task):
+    phase, start, stop = task
+    tables = GENERATORS[phase](_plan, start, stop)
+    counts = {table: len(rows) for table, _, rows in tables}
+    if _engine is None:
+        return counts, tables
+
+    with _engine.begin() as connection:
+        for table, columns, rows in tables:
+            if rows:
+                copy_rows(connection, table, columns, rows)
+    return counts, None
+
+
+def uses_copy(url):
+    url = make_url(url)
+    return url.get_backend_name() == "postgresql" and url.get_driver_name() == "psycopg2"
+
+
+def generate(app, plan, workers):
+    """Generate every phase; returns {table: rows loaded}"""
+    from src.config.database import db
+
+    url = app.config["SQLALCHEMY_DATABASE_URI"]
+    copy = uses_copy(url)
+    totals = {}
+    # Spawned rather than forked: workers share no connections with the parent
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers, _init_worker, (plan, url if copy else None)) as pool:
+        for phase, _, size in PHASES:
+            started = time.perf_counter()
+            tasks = [
+                (phase, start, min(start + CHUNK_SIZE, size(plan)))
+                for start in range(0, size(plan), CHUNK_SIZE)
+            ]
+            with app.app_context():
+                for counts, tables in pool.imap_unordered(_run_chunk, tasks):
+                    if tables is not None:
+                        with db.engine.begin() as connection:
+                            for table, columns, rows in tables:
+                                insert_rows(connection, table, columns, rows)
+                    for name, count in counts.items():
+                        totals[name] = totals.get(name, 0) + count
+
+            print(
+                f"{phase}: {len(tasks)} chunks in {time.perf_counter() - started:.1f}s",
+                file=sys.stderr,
+            )
+    return totals
+
+
+def finish(app):
+    """Rebuild derived tables and refresh planner statistics"""
+    from src.config.database import db
+    from src.models.album_availability import rebuild_album_availability
+
+    with app.app_context():
+        rebuild_album_availability(db.session)
+        db.session.commit()
+        if db.engine.dialect.name == "postgresql":
+            # ANALYZE cannot run inside a transaction block
+            with db.engine.connect().execution_options(
+                isolation_level="AUTOCOMMIT"
+            ) as connection:
+                connection.execute(text("ANALYZE"))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", default="benchmark", help="settings profile (default benchmark)")
+    parser.add_argument("--database-url", help="database to fill, must be empty")
+    parser.add_argument("--seed", type=int, default=42, help="same seed and sizes, same rows")
+    parser.add_argument("--stores", type=int, default=10)
+    parser.add_argument("--attendants-per-store", type=int, default=4)
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--albums", type=int, default=20_000)
+    parser.add_argument("--copies", type=int, default=3, help="inventory items per album")
+    parser.add_argument("--years", type=int, default=3, help="years of rental history")
+    parser.add_argument(
+        "--rental-gap-days", type=float, default=20.0,
+        help="mean days between rentals of one copy",
+    )
+    parser.add_argument(
+        "--end-date", type=date.fromisoformat, default=date.today(),
+        help="last day of history, YYYY-MM-DD (default today)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=multiprocessing.cpu_count(),
+        help="generator processes (default one per CPU)",
+    )
+    args = parser.parse_args(argv)
+    for name in ("stores", "attendants_per_store", "customers", "albums", "copies", "years", "workers"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from app import create_app
+    from src.config.database import db
+
+    config = {}
+    if args.database_url:
+        config["SQLALCHEMY_DATABASE_URI"] = args.database_url
+    app = create_app(args.profile, config)
+
+    with app.app_context():
+        if db.session.query(Person.id).first() or db.session.query(Store.id).first():
+            raise GenerationError("The database already has data, generate into an empty one")
+        db.session.remove()
+
+    started = time.perf_counter()
+    totals = generate(app, Plan(args), args.workers)
+    finish(app)
+
+    for name, count in totals.items():
+        print(f"{name}: {count} rows", file=sys.stderr)
+    print(f"Done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
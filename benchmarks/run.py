@@ -0,0 +1,301 @@
+"""Benchmark the API in process and compare against a stored baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --save-baseline
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+
+Exits with 1 when an endpoint fails or regressed against the baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+from benchmarks.scenarios import SCENARIOS, Request, discover
+from benchmarks.seed import seed_database
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Runs are only comparable when these match
+COMPARABLE = ("database", "requests", "concurrency")
+COMPARED = (("p50_ms", "latency"), ("p95_ms", "latency"), ("throughput_rps", "throughput"))
+
+
+class Recorder:
+    """Latency samples and failures per endpoint, shared by the client threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+        self.elapsed = {}
+
+    def add(self, key, seconds, ok):
+        with self._lock:
+            entry = self.endpoints.setdefault(key, {"samples": [], "errors": 0})
+            entry["samples"].append(seconds)
+            if not ok:
+                entry["errors"] += 1
+
+    def add_elapsed(self, scenario, seconds):
+        with self._lock:
+            self.elapsed[scenario] = self.elapsed.get(scenario, 0.0) + seconds
+
+    def summary(self, scenario_of):
+        return {
+            key: summarize(entry, self.elapsed[scenario_of[key]])
+            for key, entry in sorted(self.endpoints.items())
+        }
+
+
+class Session:
+    """One client thread running a scenario; ``request`` times a call"""
+
+    def __init__(self, client, prefix, recorder, scenario_of, scenario):
+        self.client = client
+        self.prefix = prefix
+        self.recorder = recorder
+        self.scenario_of = scenario_of
+        self.scenario = scenario
+        self.flow = not isinstance(SCENARIOS[scenario], Request)
+
+    def request(self, method, endpoint, path, expected=200, json=None):
+        """Returns the JSON body, or None when the status was not ``expected``"""
+        # Steps of a flow are kept apart from the same route called on its own
+        key = f"{self.scenario}: {endpoint}" if self.flow else endpoint
+        self.scenario_of[key] = self.scenario
+
+        started = time.perf_counter()
+        response = self.client.open(self.prefix + path, method=method, json=json)
+        elapsed = time.perf_counter() - started
+
+        ok = response.status_code == expected
+        self.recorder.add(key, elapsed, ok)
+        return response.get_json() if ok else None
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(entry, elapsed):
+    ordered = sorted(entry["samples"])
+    return {
+        "requests": len(ordered),
+        "errors": entry["errors"],
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else None,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+def reset(app):
+    """Drop caches and pooled connections so the next request starts cold"""
+    from src.cache import album_cache, barcode_cache
+    from src.config.database import db
+
+    album_cache.clear()
+    barcode_cache.clear()
+    with app.app_context():
+        for engine in db.engines.values():
+            # An in-memory SQLite database lives only as long as its connection
+            if isinstance(engine.pool, QueuePool):
+                engine.dispose()
+
+
+def run_cold(app, prefix, fixtures, scenarios, runs, seed):
+    recorder, scenario_of = Recorder(), {}
+    rng = random.Random(seed)
+    client = app.test_client()
+    for name in scenarios:
+        session = Session(client, prefix, recorder, scenario_of, name)
+        for _ in range(runs):
+            reset(app)
+            started = time.perf_counter()
+            SCENARIOS[name](session, fixtures, rng)
+            recorder.add_elapsed(name, time.perf_counter() - started)
+    return recorder.summary(scenario_of)
+
+
+def run_warm(app, prefix, fixtures, scenarios, requests, warmup, concurrency, seed):
+    recorder, scenario_of = Recorder(), {}
+    for name in scenarios:
+        # Warm-up calls fill caches and pools and are not recorded
+        session = Session(app.test_client(), prefix, Recorder(), {}, name)
+        rng = random.Random(seed)
+        for _ in range(warmup):
+            SCENARIOS[name](session, fixtures, rng)
+
+        def client_thread(index, count):
+            session = Session(app.test_client(), prefix, recorder, scenario_of, name)
+            rng = random.Random(seed * 1000 + index)
+            for _ in range(count):
+                SCENARIOS[name](session, fixtures, rng)
+
+        shares = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+        threads = [
+            threading.Thread(target=client_thread, args=(index, count))
+            for index, count in enumerate(shares)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        recorder.add_elapsed(name, time.perf_counter() - started)
+    return recorder.summary(scenario_of)
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Regressions of the warm run against ``baseline``, as messages"""
+    regressions = []
+    for key, before in baseline["warm"].items():
+        after = results["warm"].get(key)
+        if after is None:
+            continue
+        for metric, kind in COMPARED:
+            old, new = before.get(metric), after.get(metric)
+            if not old or new is None:
+                continue
+            if kind == "latency":
+                regressed = new > old * (1 + tolerance) and new - old > min_delta_ms
+            else:
+                regressed = new < old * (1 - tolerance)
+            if regressed:
+                regressions.append(f"{key}: {metric} {old} -> {new}")
+    return regressions
+
+
+def print_summary(results, stream=sys.stderr):
+    for phase in ("cold", "warm"):
+        print(f"\n{phase}", file=stream)
+        print(
+            f"{'endpoint':58} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err':>4}",
+            file=stream,
+        )
+        for key, stats in results[phase].items():
+            print(
+                f"{key[:58]:58} {stats['throughput_rps'] or 0:9.1f} {stats['p50_ms']:9.2f} "
+                f"{stats['p95_ms']:9.2f} {stats['p99_ms']:9.2f} {stats['errors']:4d}",
+                file=stream,
+            )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", default="benchmark", help="settings profile (default benchmark)")
+    parser.add_argument("--database-url", help="database to run against, seeded when empty")
+    parser.add_argument("--requests", type=int, default=200, help="measured iterations per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured iterations per scenario")
+    parser.add_argument("--cold-runs", type=int, default=5, help="cold iterations per scenario")
+    parser.add_argument("--concurrency", type=int, default=1, help="client threads per scenario")
+    parser.add_argument("--seed", type=int, default=42, help="seed for the data and the request mix")
+    parser.add_argument("--scenarios", help="comma separated scenario names (default all)")
+    parser.add_argument("--output", help="write the results here instead of stdout")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore latency changes below this")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    scenarios = list(SCENARIOS)
+    if args.scenarios:
+        scenarios = [name.strip() for name in args.scenarios.split(",")]
+        unknown = [name for name in scenarios if name not in SCENARIOS]
+        if unknown:
+            sys.exit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    from app import create_app
+    from src.config.api import api
+
+    config = {}
+    if args.database_url:
+        config["SQLALCHEMY_DATABASE_URI"] = args.database_url
+    app = create_app(args.profile, config)
+    prefix = api.prefix
+
+    client = app.test_client()
+    if not client.get(f"{prefix}/stores?limit=1").get_json()["items"]:
+        print("Seeding an empty database", file=sys.stderr)
+        seed_database(client, prefix, random.Random(args.seed))
+    fixtures = discover(client, prefix)
+
+    results = {
+        "meta": {
+            "profile": args.profile,
+            "database": make_url(app.config["SQLALCHEMY_DATABASE_URI"]).get_backend_name(),
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "cold_runs": args.cold_runs,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "cold": run_cold(app, prefix, fixtures, scenarios, args.cold_runs, args.seed),
+        "warm": run_warm(
+            app, prefix, fixtures, scenarios,
+            args.requests, args.warmup, args.concurrency, args.seed,
+        ),
+    }
+    print_summary(results)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    failed = [key for key, stats in results["warm"].items() if stats["errors"]]
+    failed += [key for key, stats in results["cold"].items() if stats["errors"]]
+    for key in failed:
+        print(f"FAILED {key}: requests returned an unexpected status", file=sys.stderr)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            file.write(output + "\n")
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+        return 1 if failed else 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, nothing to compare", file=sys.stderr)
+        return 1 if failed else 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    mismatched = [
+        key for key in COMPARABLE if baseline["meta"].get(key) != results["meta"][key]
+    ]
+    if mismatched:
+        print(
+            f"Baseline not comparable, it differs in: {', '.join(mismatched)}",
+            file=sys.stderr,
+        )
+        return 2
+
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import queue
+from dataclasses import dataclass, field
+
+PAYMENT_METHODS = ["cash", "credit_card", "debit_card", "pix"]
+
+# Namespaces with a paginated list and a get-by-id route
+RESOURCES = [
+    "stores",
+    "addresses",
+    "attendants",
+    "customers",
+    "albums",
+    "inventory-items",
+    "rentals",
+    "payments",
+]
+
+
+class ScenarioError(RuntimeError):
+    pass
+
+
+@dataclass
+class Fixtures:
+    """Ids and values the scenarios pick from, read back from the database"""
+
+    ids: dict = field(default_factory=dict)
+    barcodes: list = field(default_factory=list)
+    artists: list = field(default_factory=list)
+    genres: list = field(default_factory=list)
+    words: list = field(default_factory=list)
+    # Items free to rent; a checkout takes one and its return puts it back
+    available: queue.Queue = field(default_factory=queue.Queue)
+
+    def pick(self, rng, resource):
+        return rng.choice(self.ids[resource])
+
+
+def discover(client, prefix, size=100):
+    """Fixtures from the first ``size`` rows of every resource"""
+    fixtures = Fixtures()
+    rows = {}
+    for resource in RESOURCES:
+        response = client.get(f"{prefix}/{resource}?limit={size}")
+        if response.status_code != 200:
+            raise ScenarioError(f"GET /{resource} returned {response.status_code}")
+        rows[resource] = response.get_json()["items"]
+        fixtures.ids[resource] = [row["id"] for row in rows[resource]]
+
+    missing = [resource for resource, ids in fixtures.ids.items() if not ids]
+    if missing:
+        raise ScenarioError(f"No rows to benchmark with in: {', '.join(missing)}")
+
+    fixtures.barcodes = [row["barcode"] for row in rows["inventory-items"]]
+    fixtures.artists = sorted({row["artist"] for row in rows["albums"]})
+    fixtures.genres = sorted({row["genre"] for row in rows["albums"]})
+    fixtures.words = sorted(
+        {word for row in rows["albums"] for word in row["title"].split() if word.isalpha()}
+    )
+
+    # Not paginated: every available item comes back
+    response = client.get(f"{prefix}/inventory-items/available")
+    for row in response.get_json()[:size]:
+        fixtures.available.put(row["id"])
+    if fixtures.available.empty():
+        raise ScenarioError("No available inventory items to check out")
+    return fixtures
+
+
+class Request:
+    """A single timed request, labelled by its route rather than its URL"""
+
+    def __init__(self, endpoint, build, expected=200):
+        self.endpoint = endpoint
+        self.method = endpoint.split(" ", 1)[0]
+        self.build = build
+        self.expected = expected
+
+    def __call__(self, session, fixtures, rng):
+        session.request(self.method, self.endpoint, self.build(fixtures, rng), self.expected)
+
+
+def checkout(session, fixtures, rng):
+    """Rent a copy, pay for it and return it, like a counter would"""
+    item_id = fixtures.available.get()
+    try:
+        rental = session.request("POST", "POST /rentals", "/rentals", 201, json={
+            "customer_id": fixtures.pick(rng, "customers"),
+            "item_id": item_id,
+            "attendant_id": fixtures.pick(rng, "attendants"),
+        })
+        if rental is None:
+            return
+
+        payment = session.request("POST", "POST /payments", "/payments", 201, json={
+            "rental_id": rental["id"],
+            "amount": 19.9,
+            "payment_method": rng.choice(PAYMENT_METHODS),
+        })
+        if payment is not None:
+            session.request(
+                "POST", "POST /payments/<id>/complete",
+                f"/payments/{payment['id']}/complete",
+            )
+
+        session.request(
+            "POST", "POST /rentals/<id>/return", f"/rentals/{rental['id']}/return"
+        )
+    finally:
+        fixtures.available.put(item_id)
+
+
+def scan_rental(session, fixtures, rng):
+    """Barcode lookup, then the item is marked rented and back"""
+    item_id = fixtures.available.get()
+    try:
+        item = session.request(
+            "GET", "GET /inventory-items/<id>", f"/inventory-items/{item_id}"
+        )
+        if item is None:
+            return
+        session.request(
+            "GET", "GET /inventory-items/barcode/<barcode>",
+            f"/inventory-items/barcode/{item['barcode']}",
+        )
+        if session.request(
+            "POST", "POST /inventory-items/<id>/rent", f"/inventory-items/{item_id}/rent"
+        ) is not None:
+            session.request(
+                "POST", "POST /inventory-items/<id>/return",
+                f"/inventory-items/{item_id}/return",
+            )
+    finally:
+        fixtures.available.put(item_id)
+
+
+def _list(resource):
+    return Request(f"GET /{resource}", lambda f, rng: f"/{resource}?limit=20")
+
+
+def _get(resource):
+    return Request(
+        f"GET /{resource}/<id>", lambda f, rng: f"/{resource}/{f.pick(rng, resource)}"
+    )
+
+
+# name -> scenario; every scenario is called as scenario(session, fixtures, rng)
+SCENARIOS = {
+    **{f"list {resource}": _list(resource) for resource in RESOURCES},
+    **{f"get {resource}": _get(resource) for resource in RESOURCES},
+    "search albums": Request(
+        "GET /albums/search",
+        lambda f, rng: f"/albums/search?q={rng.choice(f.words)}+{rng.choice(f.words)}",
+    ),
+    "albums by artist": Request(
+        "GET /albums/artist/<artist>",
+        lambda f, rng: f"/albums/artist/{rng.choice(f.artists)}",
+    ),
+    "albums by genre": Request(
+        "GET /albums/genre/<genre>",
+        lambda f, rng: f"/albums/genre/{rng.choice(f.genres)}",
+    ),
+    "album availability": Request(
+        "GET /albums/<id>/availability",
+        lambda f, rng: f"/albums/{f.pick(rng, 'albums')}/availability",
+    ),
+    "barcode scan": Request(
+        "GET /inventory-items/barcode/<barcode>",
+        lambda f, rng: f"/inventory-items/barcode/{rng.choice(f.barcodes)}",
+    ),
+    "available items": Request(
+        "GET /inventory-items/available", lambda f, rng: "/inventory-items/available"
+    ),
+    "store items": Request(
+        "GET /inventory-items/store/<id>",
+        lambda f, rng: f"/inventory-items/store/{f.pick(rng, 'stores')}",
+    ),
+    "active rentals": Request("GET /rentals/active", lambda f, rng: "/rentals/active"),
+    "overdue rentals": Request("GET /rentals/overdue", lambda f, rng: "/rentals/overdue"),
+    "revenue report": Request(
+        "GET /payments/reports",
+        lambda f, rng: "/payments/reports?group_by=month,store",
+    ),
+    "instrumentation": Request(
+        "GET /admin/instrumentation", lambda f, rng: "/admin/instrumentation"
+    ),
+    "metrics": Request("GET /metrics", lambda f, rng: "/metrics"),
+    "checkout": checkout,
+    "scan rental": scan_rental,
+}
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+ARTISTS = [
+    "Miles Davis", "Nina Simone", "Caetano Veloso", "Gal Costa", "Radiohead",
+    "Taylor Swift", "Elis Regina", "John Coltrane", "Bjork", "Chico Buarque",
+]
+GENRES = ["Jazz", "MPB", "Rock", "Pop", "Samba", "Electronic", "Blues", "Soul"]
+WORDS = [
+    "Blue", "Night", "Kind", "Love", "Summer", "River", "Electric", "Quiet",
+    "Golden", "Broken", "City", "Morning", "Velvet", "Paper", "Wild", "Silver",
+]
+PAYMENT_METHODS = ["cash", "credit_card", "debit_card", "pix"]
+
+
+class SeedError(RuntimeError):
+    pass
+
+
+def _digits(rng, length):
+    # A leading 1 keeps the value from being all the same digit
+    return "1" + "".join(str(rng.randrange(10)) for _ in range(length - 1))
+
+
+def _phone(rng):
+    return "859" + "".join(str(rng.randrange(10)) for _ in range(8))
+
+
+def _post(client, path, payload, expected=(201,)):
+    response = client.post(path, json=payload)
+    if response.status_code not in expected:
+        raise SeedError(
+            f"POST {path} returned {response.status_code}: "
+            f"{response.get_data(as_text=True)}"
+        )
+    return response.get_json()
+
+
+def seed_database(client, prefix, rng, stores=3, albums=200, customers=100,
+                  copies=2, rentals=40):
+    """Create a small, consistent dataset through the API.
+
+    Going through the routes keeps every row valid for the validators and
+    the album availability counts in step. ``rentals`` past rentals are
+    created, the older half of them still open so overdue lists have rows.
+    """
+    store_ids, attendant_ids = [], []
+    for index in range(stores):
+        store = _post(client, f"{prefix}/stores", {
+            "cnpj": _digits(rng, 14),
+            "trade_name": f"Benchmark Store {index + 1}",
+        })
+        store_ids.append(store["id"])
+        _post(client, f"{prefix}/addresses", {
+            "street": f"Rua {rng.choice(WORDS)}",
+            "number": str(rng.randrange(1, 3000)),
+            "neighborhood": "Centro",
+            "city": "Fortaleza",
+            "state": "CE",
+            "zip_code": "60160000",
+            "store_id": store["id"],
+        })
+        for number in range(2):
+            attendant = _post(client, f"{prefix}/attendants", {
+                "cpf": _digits(rng, 11),
+                "name": f"Attendant {index + 1}{number + 1}",
+                "phone": _phone(rng),
+                "email": f"attendant{index + 1}{number + 1}@store.example.com",
+                "store_id": store["id"],
+            })
+            attendant_ids.append(attendant["id"])
+
+    customer_ids = []
+    for index in range(customers):
+        customer = _post(client, f"{prefix}/customers", {
+            "cpf": _digits(rng, 11),
+            "name": f"Customer {index + 1}",
+            "phone": _phone(rng),
+            "email": f"customer{index + 1}@example.com",
+        })
+        customer_ids.append(customer["id"])
+
+    album_ids = []
+    for index in range(albums):
+        album = _post(client, f"{prefix}/albums", {
+            "title": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {index + 1}",
+            "artist": rng.choice(ARTISTS),
+            "genre": rng.choice(GENRES),
+            "rental_price": round(rng.uniform(5, 40), 2),
+        })
+        album_ids.append(album["id"])
+
+    items = [
+        {
+            "barcode": f"BENCH-{index:04d}-{copy}",
+            "album_id": album_id,
+            "store_id": rng.choice(store_ids),
+            "status": "available",
+        }
+        for index, album_id in enumerate(album_ids)
+        for copy in range(copies)
+    ]
+    result = _post(client, f"{prefix}/inventory-items/bulk", {"items": items})
+    item_ids = [row["id"] for row in result["results"]]
+
+    now = datetime.now()
+    for index, item_id in enumerate(rng.sample(item_ids, min(rentals, len(item_ids)))):
+        rental = _post(client, f"{prefix}/rentals", {
+            "customer_id": rng.choice(customer_ids),
+            "item_id": item_id,
+            "attendant_id": rng.choice(attendant_ids),
+            "rental_date": (now - timedelta(days=rentals - index)).isoformat(),
+        })
+        _post(client, f"{prefix}/payments", {
+            "rental_id": rental["id"],
+            "amount": round(rng.uniform(5, 40), 2),
+            "payment_method": rng.choice(PAYMENT_METHODS),
+            "status": "completed",
+        })
+        if index >= rentals // 2:
+            _post(client, f"{prefix}/rentals/{rental['id']}/return", None, (200,))
@@ -0,0 +1,62 @@
+"""album availability aggregate
+
+Per album, store and status copy counts kept up to date with inventory_items.
+db.create_all() creates the table on a fresh database; this revision adds it
+to existing ones and fills it from inventory_items.
+
+Revision ID: 40d0f6f1e0aa
+Revises: 7a637ccc0199
+Create Date: 2026-10-18 11:40:28.945749
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.models.inventory_item import VALID_STATUSES
+
+
+# revision identifiers, used by Alembic.
+revision = '40d0f6f1e0aa'
+down_revision = '7a637ccc0199'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("album_availability"):
+        # status_enum already exists on PostgreSQL, it belongs to inventory_items
+        status = sa.Enum(*VALID_STATUSES, name="status_enum").with_variant(
+            postgresql.ENUM(*VALID_STATUSES, name="status_enum", create_type=False),
+            "postgresql",
+        )
+        op.create_table(
+            "album_availability",
+            sa.Column(
+                "album_id",
+                sa.Uuid(),
+                sa.ForeignKey("albums.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column(
+                "store_id",
+                sa.Uuid(),
+                sa.ForeignKey("stores.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("status", status, nullable=False),
+            sa.Column("item_count", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("album_id", "store_id", "status"),
+        )
+
+    op.execute("DELETE FROM album_availability")
+    op.execute(
+        "INSERT INTO album_availability (album_id, store_id, status, item_count) "
+        "SELECT album_id, store_id, status, count(*) FROM inventory_items "
+        "GROUP BY album_id, store_id, status"
+    )
+
+
+def downgrade():
+    op.drop_table("album_availability")
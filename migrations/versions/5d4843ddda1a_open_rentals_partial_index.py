@@ -0,0 +1,35 @@
+"""open rentals partial index
+
+Indexes (rental_date, id) of rentals not yet returned, for the overdue list.
+
+Revision ID: 5d4843ddda1a
+Revises: 40d0f6f1e0aa
+Create Date: 2026-10-18 11:43:12.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d4843ddda1a'
+down_revision = '40d0f6f1e0aa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_rentals_open_rental_date",
+        "rentals",
+        ["rental_date", "id"],
+        postgresql_where=sa.text("return_date IS NULL"),
+        sqlite_where=sa.text("return_date IS NULL"),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_rentals_open_rental_date", table_name="rentals", if_exists=True
+    )
@@ -0,0 +1,62 @@
+"""album search indexes
+
+Trigram and full-text indexes backing album search. Tables are created by
+db.create_all() on startup, which also builds these indexes on a fresh
+database; this revision adds them to databases created before them.
+
+Revision ID: 7a637ccc0199
+Revises: 
+Create Date: 2026-10-18 11:31:06.115616
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a637ccc0199'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Written out rather than taken from the model, so this revision keeps
+# building the same indexes whatever the model does later. Queries must use
+# the same expression as Album.search_document() for the planner to pick it.
+SEARCH_DOCUMENT = (
+    "((setweight(to_tsvector('simple'::regconfig, title), 'A')"
+    " || setweight(to_tsvector('simple'::regconfig, artist), 'B'))"
+    " || setweight(to_tsvector('simple'::regconfig, genre), 'C'))"
+)
+TRIGRAM_COLUMNS = ("title", "artist", "genre")
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_albums_search_document",
+        "albums",
+        [sa.text(SEARCH_DOCUMENT)],
+        postgresql_using="gin",
+        if_not_exists=True,
+    )
+    for name in TRIGRAM_COLUMNS:
+        op.create_index(
+            f"ix_albums_{name}_trgm",
+            "albums",
+            [name],
+            postgresql_using="gin",
+            postgresql_ops={name: "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for name in TRIGRAM_COLUMNS:
+        op.drop_index(f"ix_albums_{name}_trgm", table_name="albums", if_exists=True)
+    op.drop_index("ix_albums_search_document", table_name="albums", if_exists=True)
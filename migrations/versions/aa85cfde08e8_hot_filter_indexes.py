@@ -0,0 +1,51 @@
+"""hot filter indexes
+
+Secondary indexes for the columns controllers filter on, and the
+(created_at, primary key) index every paginated list seeks on.
+
+Revision ID: aa85cfde08e8
+Revises: 5d4843ddda1a
+Create Date: 2026-10-18 11:43:04.821453
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'aa85cfde08e8'
+down_revision = '5d4843ddda1a'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_inventory_items_store_id_status", "inventory_items", ["store_id", "status"]),
+    ("ix_inventory_items_album_id_status", "inventory_items", ["album_id", "status"]),
+    ("ix_inventory_items_status", "inventory_items", ["status"]),
+    ("ix_rentals_customer_id", "rentals", ["customer_id"]),
+    ("ix_rentals_attendant_id", "rentals", ["attendant_id"]),
+    ("ix_rentals_item_id_return_date", "rentals", ["item_id", "return_date"]),
+    ("ix_rentals_return_date", "rentals", ["return_date"]),
+    ("ix_payments_rental_id", "payments", ["rental_id"]),
+    ("ix_payments_status", "payments", ["status"]),
+    ("ix_payments_payment_method", "payments", ["payment_method"]),
+    ("ix_payments_payment_date", "payments", ["payment_date"]),
+    ("ix_albums_created_at_id", "albums", ["created_at", "id"]),
+    ("ix_persons_created_at_id", "persons", ["created_at", "id"]),
+    ("ix_stores_created_at_id", "stores", ["created_at", "id"]),
+    ("ix_attendants_created_at_person_id", "attendants", ["created_at", "person_id"]),
+    ("ix_customers_created_at_person_id", "customers", ["created_at", "person_id"]),
+    ("ix_inventory_items_created_at_id", "inventory_items", ["created_at", "id"]),
+    ("ix_addresses_created_at_id", "addresses", ["created_at", "id"]),
+    ("ix_rentals_created_at_id", "rentals", ["created_at", "id"]),
+    ("ix_payments_created_at_id", "payments", ["created_at", "id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
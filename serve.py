@@ -0,0 +1,63 @@
+import multiprocessing
+
+from gunicorn.app.base import BaseApplication
+
+from app import create_app
+from src.config.warmup import (
+    dispose_engines,
+    prepare_for_fork,
+    start_cache_invalidation,
+    start_metrics_flusher,
+    warm_up,
+)
+
+
+class StoreApplication(BaseApplication):
+    """Gunicorn running one preloaded ``create_app()``.
+
+    The app is built in the master before forking, so workers share its
+    imported code and Swagger schema. Each worker then drops the inherited
+    database connections and warms its own pools and caches before it
+    accepts requests. Workers hear about each other's commits to keep
+    their caches current.
+    """
+
+    def __init__(self, profile=None):
+        self.application = create_app(profile)
+        prepare_for_fork(self.application)
+        super().__init__()
+
+    def load_config(self):
+        config = self.application.config
+        workers = config["SERVER_WORKERS"] or multiprocessing.cpu_count() * 2 + 1
+        settings = {
+            "bind": config["SERVER_BIND"],
+            "workers": workers,
+            "threads": config["SERVER_THREADS"],
+            "timeout": config["SERVER_TIMEOUT"],
+            "preload_app": True,
+            "post_fork": self.post_fork,
+            "post_worker_init": self.post_worker_init,
+        }
+        for key, value in settings.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+    def post_fork(self, server, worker):
+        dispose_engines(self.application)
+        start_metrics_flusher(self.application)
+        start_cache_invalidation(self.application)
+
+    def post_worker_init(self, worker):
+        if not self.application.config["SERVER_WARMUP"]:
+            return
+
+        # One connection per thread, capped by the pool size
+        report = warm_up(self.application, self.application.config["SERVER_THREADS"])
+        worker.log.info("Worker %s warmed up: %s", worker.pid, report)
+
+
+if __name__ == "__main__":
+    StoreApplication().run()
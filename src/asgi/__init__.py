@@ -0,0 +1,11 @@
+from .database import async_url, build_async_engine, build_sessionmaker
+from .reads import RESOURCES, ReadResource, read_routes
+
+__all__ = [
+    "async_url",
+    "build_async_engine",
+    "build_sessionmaker",
+    "RESOURCES",
+    "ReadResource",
+    "read_routes",
+]
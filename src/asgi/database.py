@@ -0,0 +1,40 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.config.database import build_engine_options, enable_sqlite_foreign_keys
+
+# Async drivers that stand in for the sync ones of the same database
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_url(url):
+    """The profile's database URL with its driver swapped for an asyncio one"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for '{backend}'")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def build_async_engine(config):
+    url = async_url(config["SQLALCHEMY_DATABASE_URI"])
+    options = build_engine_options(config)
+    # The timed pool is synchronous, asyncio engines bring their own
+    options.pop("poolclass", None)
+
+    # asyncpg takes server settings instead of libpq's "options" string
+    if options.pop("connect_args", None):
+        options["connect_args"] = {
+            "server_settings": {
+                "statement_timeout": str(config["DB_STATEMENT_TIMEOUT_MS"])
+            }
+        }
+
+    engine = create_async_engine(url, echo=config["SQLALCHEMY_ECHO"], **options)
+    enable_sqlite_foreign_keys(engine.sync_engine)
+    return engine
+
+
+def build_sessionmaker(engine):
+    # Reads only: nothing is flushed, and rows stay readable after commit
+    return async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
@@ -0,0 +1,160 @@
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import contains_eager, raiseload
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from werkzeug.http import parse_etags, quote_etag
+
+from src.controllers.album_controller import (
+    availability_statement,
+    summarize_availability,
+)
+from src.controllers.base_controller import (
+    apply_keyset,
+    build_page,
+    encode_cursor,
+    etag_for,
+    get_page_args,
+    page_etag,
+)
+from src.models.address import Address
+from src.models.album import Album
+from src.models.attendant import Attendant
+from src.models.customer import Customer
+from src.models.inventory_item import InventoryItem
+from src.models.payment import Payment
+from src.models.rental import Rental
+from src.models.store import Store
+
+
+def not_modified(request, etag, weak=False):
+    """A 304 response when the client already holds ``etag``, else None"""
+    if parse_etags(request.headers.get("if-none-match")).contains_weak(etag):
+        return Response(status_code=304, headers={"ETag": quote_etag(etag, weak)})
+    return None
+
+
+def tagged(content, etag, weak=False):
+    return JSONResponse(content, headers={"ETag": quote_etag(etag, weak)})
+
+
+def error(message, details, status_code):
+    return JSONResponse({"error": message, "details": details}, status_code)
+
+
+class ReadResource:
+    """List and get-by-id of one model, with the payloads and ETags of the
+    Flask controllers so clients can use either entry point.
+    """
+
+    def __init__(self, path, model, with_person=False):
+        self.path = path
+        self.model = model
+        self.id_column = inspect(model).primary_key[0]
+        # Customers and attendants carry their person's fields
+        self.with_person = with_person
+
+    def list_statement(self):
+        statement = select(self.model)
+        if self.with_person:
+            statement = statement.join(self.model.person).options(
+                contains_eager(self.model.person)
+            )
+        return statement.options(raiseload("*"))
+
+    def etag_parts(self, record):
+        parts = [getattr(record, self.id_column.key), record.updated_at]
+        if self.with_person:
+            parts.append(record.person.updated_at)
+        return parts
+
+    def etag_for(self, record):
+        return etag_for(self.model.__tablename__, *self.etag_parts(record))
+
+    def cursor_for(self, record):
+        return encode_cursor(record.created_at, getattr(record, self.id_column.key))
+
+    async def get_all(self, request):
+        try:
+            cursor, limit = get_page_args(request.query_params)
+            statement = apply_keyset(
+                self.list_statement(),
+                self.model.created_at,
+                self.id_column,
+                cursor,
+                limit,
+            )
+            async with request.app.state.sessions() as session:
+                records = (await session.scalars(statement)).all()
+
+            page = build_page(records, limit, self.cursor_for)
+            etag = page_etag(self.model.__tablename__, page, self.etag_parts)
+            response = not_modified(request, etag, weak=True)
+            if response:
+                return response
+
+            page["items"] = [record.to_dict() for record in page["items"]]
+            return tagged(page, etag, weak=True)
+        except ValueError as e:
+            return error("Invalid pagination parameters", str(e), 400)
+        except SQLAlchemyError as e:
+            return error("Database error occurred", str(e), 500)
+
+    async def get_by_id(self, request):
+        try:
+            statement = self.list_statement().where(
+                self.id_column == request.path_params["record_id"]
+            )
+            async with request.app.state.sessions() as session:
+                record = (await session.scalars(statement)).first()
+            if not record:
+                return JSONResponse({"error": "Record not found"}, 404)
+            etag = self.etag_for(record)
+            return not_modified(request, etag) or tagged(record.to_dict(), etag)
+        except SQLAlchemyError as e:
+            return error("Database error occurred", str(e), 500)
+
+    def routes(self, prefix):
+        path = f"{prefix}{self.path}"
+        return [
+            Route(path, self.get_all, methods=["GET"]),
+            Route(f"{path}/{{record_id:uuid}}", self.get_by_id, methods=["GET"]),
+        ]
+
+
+RESOURCES = [
+    ReadResource("/customers", Customer, with_person=True),
+    ReadResource("/albums", Album),
+    ReadResource("/attendants", Attendant, with_person=True),
+    ReadResource("/addresses", Address),
+    ReadResource("/stores", Store),
+    ReadResource("/inventory-items", InventoryItem),
+    ReadResource("/rentals", Rental),
+    ReadResource("/payments", Payment),
+]
+
+
+async def get_album_availability(request):
+    album_id = request.path_params["album_id"]
+    try:
+        async with request.app.state.sessions() as session:
+            if not await session.scalar(select(Album.id).where(Album.id == album_id)):
+                return JSONResponse({"error": "Album not found"}, 404)
+            rows = (await session.execute(availability_statement([album_id]))).all()
+        return JSONResponse(summarize_availability([album_id], rows)[0])
+    except SQLAlchemyError as e:
+        return error("Database error occurred", str(e), 500)
+
+
+def read_routes(prefix="/api"):
+    """GET routes answered on the event loop, under the API prefix"""
+    routes = [
+        Route(
+            f"{prefix}/albums/{{album_id:uuid}}/availability",
+            get_album_availability,
+            methods=["GET"],
+        )
+    ]
+    for resource in RESOURCES:
+        routes.extend(resource.routes(prefix))
+    return routes
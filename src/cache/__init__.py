@@ -0,0 +1,28 @@
+from .ttl_cache import TTLCache
+from .invalidation import CacheInvalidation, invalidation
+from .album_cache import AlbumCache, album_cache
+from .barcode_cache import BarcodeCache, ScannedItem, barcode_cache
+
+
+def config_cache(app):
+    album_cache.configure(
+        app.config["ALBUM_CACHE_SIZE"],
+        app.config["ALBUM_CACHE_TTL_SECONDS"],
+        app.config["ALBUM_CATALOG_MAX_ROWS"],
+    )
+    barcode_cache.configure(
+        app.config["BARCODE_CACHE_SIZE"], app.config["BARCODE_CACHE_TTL_SECONDS"]
+    )
+
+
+__all__ = [
+    "TTLCache",
+    "CacheInvalidation",
+    "invalidation",
+    "AlbumCache",
+    "album_cache",
+    "BarcodeCache",
+    "ScannedItem",
+    "barcode_cache",
+    "config_cache",
+]
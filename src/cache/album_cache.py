@@ -0,0 +1,122 @@
+from collections import namedtuple
+from uuid import UUID
+
+from sqlalchemy import event
+
+from src.cache.invalidation import invalidation
+from src.cache.ttl_cache import TTLCache
+from src.config.database import db
+from src.config.replicas import RoutingSession
+from src.models.album import Album
+
+CATALOG_KEY = "catalog"
+PENDING_KEY = "album_cache_pending"
+
+# Full catalog ordered by (created_at, id); keys[i] is the sort key of items[i]
+CatalogSnapshot = namedtuple("CatalogSnapshot", ["keys", "items"])
+
+
+class AlbumCache:
+    """Album rows by id plus a snapshot of the whole catalog, as dicts.
+
+    Rows are loaded from the primary: a replica may still hold the version a
+    commit just replaced. Entries are dropped when a commit touches an album,
+    in this process at once and in the others through ``invalidation``.
+    While a listening process cannot hear from the others, it reads through.
+    """
+
+    def __init__(self):
+        self.entries = TTLCache()
+        self.catalog = TTLCache(maxsize=1)
+        self.catalog_max_rows = 0
+
+    def configure(self, maxsize, ttl, catalog_max_rows):
+        self.entries.configure(maxsize, ttl)
+        self.catalog.configure(1, ttl)
+        self.catalog_max_rows = catalog_max_rows
+
+    def get(self, album_id):
+        """Return the album as a dict, or None when it does not exist"""
+        try:
+            # Keyed by UUID so invalidation by the ORM identity matches
+            album_id = UUID(str(album_id))
+        except ValueError:
+            return None
+        if not invalidation.coherent:
+            return self._load(album_id)
+        return self.entries.get_or_load(album_id, lambda: self._load(album_id))
+
+    def get_catalog(self):
+        """Return the catalog snapshot, or None when it exceeds catalog_max_rows
+        or cannot be trusted
+        """
+        if not invalidation.coherent:
+            return None
+        snapshot = self.catalog.get_or_load(CATALOG_KEY, self._load_catalog)
+        return None if snapshot.items is None else snapshot
+
+    def invalidate(self, album_ids):
+        self.entries.invalidate(*album_ids)
+        self.catalog.invalidate(CATALOG_KEY)
+
+    def clear(self):
+        self.entries.clear()
+        self.catalog.clear()
+
+    def stats(self):
+        stats = {"albums": self.entries.stats(), "catalog": self.catalog.stats()}
+        stats["catalog"]["max_rows"] = self.catalog_max_rows
+        return stats
+
+    @staticmethod
+    def _load(album_id):
+        album = db.session.get(Album, album_id)
+        return album.to_dict() if album else None
+
+    def _load_catalog(self):
+        albums = (
+            Album.query.order_by(Album.created_at, Album.id)
+            .limit(self.catalog_max_rows + 1)
+            .all()
+        )
+        if len(albums) > self.catalog_max_rows:
+            # Too large to hold in memory, cached as such so it is not retried
+            # on every request
+            return CatalogSnapshot(None, None)
+
+        return CatalogSnapshot(
+            [(album.created_at, album.id) for album in albums],
+            [album.to_dict() for album in albums],
+        )
+
+
+album_cache = AlbumCache()
+invalidation.register(
+    "albums",
+    lambda album_ids: album_cache.invalidate([UUID(key) for key in album_ids]),
+    album_cache.clear,
+)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_album_changes(session, flush_context):
+    changed = {
+        obj.id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, Album)
+    }
+    if changed:
+        session.info.setdefault(PENDING_KEY, set()).update(changed)
+        invalidation.publish(session, "albums", changed)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _invalidate_committed_albums(session):
+    changed = session.info.pop(PENDING_KEY, None)
+    if changed:
+        album_cache.invalidate(changed)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_album_changes(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,95 @@
+from collections import namedtuple
+
+from sqlalchemy import event, inspect, select
+
+from src.cache.invalidation import invalidation
+from src.cache.ttl_cache import TTLCache
+from src.config.database import db
+from src.config.replicas import RoutingSession
+from src.models.inventory_item import InventoryItem
+
+PENDING_KEY = "barcode_cache_pending"
+
+ScannedItem = namedtuple("ScannedItem", ["id", "album_id", "store_id", "status"])
+
+
+def normalize_barcode(barcode):
+    # Barcodes are stored the way InventoryItemValidator cleans them
+    return barcode.strip().upper()
+
+
+class BarcodeCache:
+    """What a point-of-sale scan needs about an item, keyed by barcode.
+
+    Like the album cache, rows come from the primary and entries are dropped
+    in every worker when a commit touches the item. ORM changes are tracked
+    automatically; code that changes items with Core statements must call
+    ``invalidate_on_commit`` itself.
+    """
+
+    def __init__(self):
+        self.entries = TTLCache()
+
+    def configure(self, maxsize, ttl):
+        self.entries.configure(maxsize, ttl)
+
+    def get(self, barcode):
+        """Return the ScannedItem for ``barcode``, or None when there is none"""
+        barcode = normalize_barcode(barcode)
+        if not invalidation.coherent:
+            return self._load(barcode)
+        return self.entries.get_or_load(barcode, lambda: self._load(barcode))
+
+    @staticmethod
+    def invalidate_on_commit(session, *barcodes):
+        """Drop ``barcodes`` once the session's transaction commits"""
+        session.info.setdefault(PENDING_KEY, set()).update(barcodes)
+        invalidation.publish(session, "barcodes", barcodes)
+
+    def invalidate(self, barcodes):
+        self.entries.invalidate(*barcodes)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return self.entries.stats()
+
+    @staticmethod
+    def _load(barcode):
+        row = db.session.execute(
+            select(
+                InventoryItem.id,
+                InventoryItem.album_id,
+                InventoryItem.store_id,
+                InventoryItem.status,
+            ).where(InventoryItem.barcode == barcode)
+        ).first()
+        return ScannedItem(*row) if row else None
+
+
+barcode_cache = BarcodeCache()
+invalidation.register("barcodes", barcode_cache.invalidate, barcode_cache.clear)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_item_changes(session, flush_context):
+    barcodes = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, InventoryItem):
+            # Old and new values: a changed barcode frees the old one as well
+            barcodes.update(inspect(obj).attrs.barcode.history.sum())
+    if barcodes:
+        BarcodeCache.invalidate_on_commit(session, *barcodes)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _invalidate_committed_items(session):
+    barcodes = session.info.pop(PENDING_KEY, None)
+    if barcodes:
+        barcode_cache.invalidate(barcodes)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_item_changes(session):
+    session.info.pop(PENDING_KEY, None)
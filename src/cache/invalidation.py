@@ -0,0 +1,141 @@
+import json
+import select
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from src.config.database import db
+
+CHANNEL = "cache_invalidation"
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+CONNECT_TIMEOUT_SECONDS = 5.0
+KEEPALIVE_SECONDS = 10.0
+RETRY_SECONDS = 1.0
+
+NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+
+class CacheInvalidation:
+    """Spreads cache invalidations to every process serving the database.
+
+    ``publish`` sends the changed keys with ``pg_notify`` inside the writing
+    transaction, so PostgreSQL delivers them when it commits and drops them
+    when it rolls back. A process that ``start``s listening gets a thread
+    that LISTENs on a connection of its own and hands the keys to the
+    registered caches. While that connection is down, notifications may be
+    missed: ``coherent`` is False, caches must read through, and they are
+    cleared once the connection is back.
+    """
+
+    def __init__(self):
+        self._caches = {}
+        self._connected = threading.Event()
+        self._thread = None
+        self.listening = False
+
+    def register(self, name, invalidate, clear):
+        """``invalidate(keys)`` receives the keys published for ``name`` as strings"""
+        self._caches[name] = (invalidate, clear)
+
+    @property
+    def coherent(self):
+        """True when cached entries can be trusted to reflect every commit"""
+        return not self.listening or self._connected.is_set()
+
+    def publish(self, session, name, keys):
+        """Notify the other processes of ``keys`` when the session commits"""
+        bind = db.engine
+        if bind.dialect.name != "postgresql" or not keys:
+            return
+
+        # Explicit bind: inside replica_reads a plain select would go to a replica
+        connection = session.connection(bind_arguments={"bind": bind})
+        for chunk in _chunks(name, sorted(str(key) for key in keys)):
+            payload = json.dumps({"cache": name, "keys": chunk})
+            connection.execute(NOTIFY, {"channel": CHANNEL, "payload": payload})
+
+    def start(self, engine):
+        """Listen for invalidations from other processes, run once per worker.
+
+        Waits up to CONNECT_TIMEOUT_SECONDS for the first connection, so a
+        worker warming its caches right after can keep what it loads.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.listening = True
+        self._thread = threading.Thread(
+            target=self._listen_forever,
+            args=(create_engine(engine.url, poolclass=NullPool),),
+            name="cache-invalidation",
+            daemon=True,
+        )
+        self._thread.start()
+        self._connected.wait(CONNECT_TIMEOUT_SECONDS)
+
+    def dispatch(self, payload):
+        try:
+            message = json.loads(payload)
+            name, keys = message["cache"], message["keys"]
+        except (ValueError, TypeError, KeyError):
+            # Not one of ours
+            return
+        cache = self._caches.get(name)
+        if cache is not None:
+            cache[0](keys)
+
+    def clear(self):
+        for _, clear in self._caches.values():
+            clear()
+
+    def _listen_forever(self, engine):
+        while True:
+            try:
+                self._listen(engine)
+            except Exception:
+                # Never let the thread die: caches would be bypassed for good
+                pass
+            time.sleep(RETRY_SECONDS)
+
+    def _listen(self, engine):
+        connection = engine.raw_connection()
+        try:
+            listener = connection.driver_connection
+            listener.autocommit = True
+            with listener.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            # Anything committed while no one was listening is unknown
+            self.clear()
+            self._connected.set()
+
+            while True:
+                if select.select([listener], [], [], KEEPALIVE_SECONDS) == ([], [], []):
+                    # Quiet for a while; make sure the connection is still there
+                    with listener.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                listener.poll()
+                while listener.notifies:
+                    self.dispatch(listener.notifies.pop(0).payload)
+        finally:
+            self._connected.clear()
+            connection.close()
+
+
+def _chunks(name, keys):
+    """Split ``keys`` so each notification payload stays under the limit"""
+    chunk, size = [], len(json.dumps({"cache": name, "keys": []}))
+    for key in keys:
+        # Quoted, and a comma and space after the first key
+        length = len(json.dumps(key).encode()) + 2
+        if chunk and size + length > MAX_PAYLOAD_BYTES:
+            yield chunk
+            chunk, size = [], len(json.dumps({"cache": name, "keys": []}))
+        chunk.append(key)
+        size += length
+    if chunk:
+        yield chunk
+
+
+invalidation = CacheInvalidation()
@@ -0,0 +1,211 @@
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config.api import api
+from src.config.metrics import registry
+from src.config.slow_queries import slow_queries
+
+QUERY_START_KEY = "query_start"
+
+
+class RequestStats:
+    """SQL issued while serving one request"""
+
+    __slots__ = ("started", "statements", "db_seconds", "rows")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+
+
+class EndpointStats:
+    """Thread-safe totals per endpoint, plus the ``top_n`` slowest requests"""
+
+    def __init__(self, top_n=20):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._slowest = []
+        self._sequence = itertools.count()
+        self.top_n = top_n
+
+    def configure(self, top_n):
+        with self._lock:
+            self.top_n = top_n
+        self.clear()
+
+    def record(self, endpoint, path, status, seconds, stats):
+        with self._lock:
+            totals = self._endpoints.get(endpoint)
+            if totals is None:
+                totals = self._endpoints[endpoint] = {
+                    "endpoint": endpoint,
+                    "requests": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "statements": 0,
+                    "db_ms": 0.0,
+                    "rows": 0,
+                }
+            duration_ms = seconds * 1000
+            totals["requests"] += 1
+            totals["total_ms"] += duration_ms
+            totals["max_ms"] = max(totals["max_ms"], duration_ms)
+            totals["statements"] += stats.statements
+            totals["db_ms"] += stats.db_seconds * 1000
+            totals["rows"] += stats.rows
+
+            # Min-heap on duration: the root is the fastest of the slowest
+            entry = (
+                duration_ms,
+                next(self._sequence),
+                {
+                    "endpoint": endpoint,
+                    "path": path,
+                    "status": status,
+                    "duration_ms": round(duration_ms, 3),
+                    "statements": stats.statements,
+                    "db_ms": round(stats.db_seconds * 1000, 3),
+                    "rows": stats.rows,
+                    "at": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+            if len(self._slowest) < self.top_n:
+                heapq.heappush(self._slowest, entry)
+            elif self._slowest and duration_ms > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._slowest.clear()
+
+    def report(self):
+        """Endpoints by mean latency and the slowest requests, slowest first"""
+        with self._lock:
+            endpoints = [dict(totals) for totals in self._endpoints.values()]
+            slowest = [entry for _, _, entry in sorted(self._slowest, reverse=True)]
+
+        for totals in endpoints:
+            requests = totals["requests"]
+            totals["mean_ms"] = round(totals.pop("total_ms") / requests, 3)
+            totals["max_ms"] = round(totals["max_ms"], 3)
+            totals["statements_per_request"] = round(totals["statements"] / requests, 2)
+            totals["db_ms"] = round(totals["db_ms"], 3)
+        endpoints.sort(key=lambda totals: totals["mean_ms"], reverse=True)
+        return {"endpoints": endpoints[: self.top_n], "slowest_requests": slowest}
+
+
+endpoint_stats = EndpointStats()
+
+
+def current_stats():
+    """The RequestStats of the request being served, or None outside one"""
+    if not has_request_context():
+        return None
+    return g.get("sql_stats")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(QUERY_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info[QUERY_START_KEY].pop()
+    slow_queries.record(conn, statement, parameters, context, executemany, seconds)
+
+    stats = current_stats()
+    if stats is None:
+        return
+
+    stats.statements += 1
+    stats.db_seconds += seconds
+    # Rows affected by writes, rows returned when the driver reports them
+    # (psycopg2 does for SELECT, sqlite3 does not)
+    stats.rows += max(cursor.rowcount, 0)
+
+
+@event.listens_for(Engine, "handle_error")
+def _abandon_query(context):
+    # A failed statement never reaches after_cursor_execute
+    connection = context.connection
+    if connection is not None and connection.info.get(QUERY_START_KEY):
+        connection.info[QUERY_START_KEY].pop()
+
+
+def _begin_request():
+    g.sql_stats = RequestStats()
+
+
+def _finish_request(response):
+    stats = g.pop("sql_stats", None)
+    if stats is None:
+        return response
+
+    # Streamed bodies are produced after this point, their SQL is not counted
+    seconds = time.perf_counter() - stats.started
+    rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+
+    if current_app.config["INSTRUMENTATION_ENABLED"]:
+        db_ms = stats.db_seconds * 1000
+        response.headers["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={db_ms:.3f};desc="{stats.statements} statements, '
+                f'{stats.rows} rows"',
+                f"app;dur={seconds * 1000 - db_ms:.3f}",
+                f"total;dur={seconds * 1000:.3f}",
+            ]
+        )
+        endpoint_stats.record(
+            f"{request.method} {rule}",
+            request.path,
+            response.status_code,
+            seconds,
+            stats,
+        )
+
+    if current_app.config["METRICS_ENABLED"]:
+        _observe(rule, response.status_code, seconds, stats)
+
+    return response
+
+
+def _namespace(rule):
+    """The flask-restx namespace of a URL rule, e.g. albums for /api/albums"""
+    if not rule.startswith(f"{api.prefix}/"):
+        return "none"
+    return rule[len(api.prefix) + 1 :].split("/", 1)[0]
+
+
+def _observe(rule, status, seconds, stats):
+    labels = {"namespace": _namespace(rule), "route": rule, "method": request.method}
+    registry.observe("http_request_duration_seconds", labels, seconds)
+    registry.inc("http_requests_total", {**labels, "status": str(status)})
+    registry.observe(
+        "db_statements_per_request",
+        {"namespace": labels["namespace"]},
+        stats.statements,
+    )
+
+
+def config_instrumentation(app):
+    endpoint_stats.configure(app.config["INSTRUMENTATION_TOP_N"])
+    registry.configure(app.config["METRICS_DIR"], app.config["METRICS_FLUSH_SECONDS"])
+    slow_queries.configure(
+        app.config["SLOW_QUERY_MS"],
+        app.config["SLOW_QUERY_LOG_SIZE"],
+        app.config["SLOW_QUERY_EXPLAIN_RATE"],
+    )
+    if app.config["INSTRUMENTATION_ENABLED"] or app.config["METRICS_ENABLED"]:
+        app.before_request(_begin_request)
+        app.after_request(_finish_request)
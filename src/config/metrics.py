@@ -0,0 +1,259 @@
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy.pool import QueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# name -> (type, help, buckets)
+METRICS = {
+    "http_request_duration_seconds": (
+        "histogram",
+        "Request latency in seconds",
+        LATENCY_BUCKETS,
+    ),
+    "http_requests_total": ("counter", "Requests served, by status code", None),
+    "db_statements_per_request": (
+        "histogram",
+        "SQL statements issued per request",
+        STATEMENT_BUCKETS,
+    ),
+    "db_pool_wait_seconds": (
+        "histogram",
+        "Time spent waiting for a pooled database connection",
+        POOL_WAIT_BUCKETS,
+    ),
+    "db_pool_size": ("gauge", "Configured connections per pool", None),
+    "db_pool_checked_out": ("gauge", "Connections currently in use", None),
+    "db_pool_overflow": ("gauge", "Connections open beyond the pool size", None),
+}
+
+
+def _key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class MetricsRegistry:
+    """Counters and histograms of this process.
+
+    With a ``directory`` set, each worker also writes its values to
+    ``<directory>/<pid>.json`` every ``flush_interval`` seconds, so any
+    worker can merge the values of all workers when scraped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._pid = os.getpid()
+        self.directory = ""
+        self.flush_interval = 5.0
+
+    def configure(self, directory, flush_interval):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def inc(self, name, labels, value=1):
+        with self._lock:
+            self._check_pid()
+            key = (name, _key(labels))
+            self._values[key] = self._values.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        with self._lock:
+            self._check_pid()
+            key = (name, _key(labels))
+            # One count per bucket plus +Inf, then the sum
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(buckets) + 1) + [0.0]
+            series[bisect_left(buckets, value)] += 1
+            series[-1] += value
+
+    def reset(self):
+        """Forget every value, and the file of this process"""
+        with self._lock:
+            self._values.clear()
+        if self.directory:
+            try:
+                os.remove(self._path(os.getpid()))
+            except FileNotFoundError:
+                pass
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                [name, dict(labels), value.copy() if isinstance(value, list) else value]
+                for (name, labels), value in self._values.items()
+            ]
+
+    def collect(self, gauges=()):
+        """Values of every live worker, summed per series, plus ``gauges``"""
+        snapshots = [self.snapshot() + list(gauges)]
+        if self.directory:
+            for path in glob.glob(os.path.join(self.directory, "*.json")):
+                pid = int(os.path.splitext(os.path.basename(path))[0])
+                if pid == os.getpid():
+                    continue
+                if not _alive(pid):
+                    # A worker that exited; its counters restart with its
+                    # replacement, which Prometheus treats as a reset
+                    _remove(path)
+                    continue
+                try:
+                    with open(path) as file:
+                        snapshots.append(json.load(file))
+                except (OSError, ValueError):
+                    continue
+
+        merged = {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot:
+                key = (name, _key(labels))
+                if key not in merged:
+                    merged[key] = value.copy() if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    merged[key] = [a + b for a, b in zip(merged[key], value)]
+                else:
+                    merged[key] += value
+        return merged
+
+    def clear_directory(self):
+        """Remove the files of previous runs; called once before forking"""
+        if self.directory:
+            for path in glob.glob(os.path.join(self.directory, "*.json")):
+                _remove(path)
+
+    def _check_pid(self):
+        # A forked worker starts from zero, not from its parent's values
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._values.clear()
+
+    def start_flusher(self, gauges):
+        """Write this process's file every ``flush_interval`` seconds.
+
+        Run in each worker after the fork; ``gauges`` returns the worker's
+        gauge rows at flush time.
+        """
+        if not self.directory:
+            return
+
+        def flush_forever():
+            while True:
+                time.sleep(self.flush_interval)
+                try:
+                    self.flush(gauges())
+                except OSError:
+                    continue
+
+        threading.Thread(target=flush_forever, name="metrics-flush", daemon=True).start()
+
+    def flush(self, gauges=()):
+        path = self._path(os.getpid())
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(self.snapshot() + list(gauges), file)
+        os.replace(temporary, path)
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f"{pid}.json")
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+registry = MetricsRegistry()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            registry.observe(
+                "db_pool_wait_seconds", {}, time.perf_counter() - started
+            )
+
+
+def pool_gauges(engines):
+    """Gauge rows for the pools of ``engines`` ({bind key: engine})"""
+    gauges = []
+    for key, engine in engines.items():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        labels = {"engine": key or "primary"}
+        gauges.append(["db_pool_size", labels, pool.size()])
+        gauges.append(["db_pool_checked_out", labels, pool.checkedout()])
+        gauges.append(["db_pool_overflow", labels, max(pool.overflow(), 0)])
+    return gauges
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(merged):
+    """Prometheus text exposition (version 0.0.4) of ``collect()`` output"""
+    series = {}
+    for (name, labels), value in merged.items():
+        series.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        if name not in series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(series[name]):
+            if kind != "histogram":
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+
+            cumulative = 0
+            for bound, count in zip([*buckets, "+Inf"], value[:-1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(float(bound))
+                lines.append(
+                    f"{name}_bucket{_labels(labels, [('le', le)])} {cumulative}"
+                )
+            lines.append(f"{name}_sum{_labels(labels)} {_number(float(value[-1]))}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Delete, Insert, Update, text
+from sqlalchemy.exc import SQLAlchemyError
+
+REPLICA_BIND_PREFIX = "replica_"
+PINNED_REPLICA_KEY = "pinned_replica"
+
+# Seconds of replication lag; zero when the replica has replayed everything it
+# received, so an idle primary does not make its replicas look stale
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+_read_only = ContextVar("read_only", default=False)
+
+
+@contextmanager
+def read_only():
+    """Send the queries issued inside the block to a healthy read replica"""
+    token = _read_only.set(True)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+def replica_reads(func):
+    """Send the queries issued by ``func`` to a read replica when one is healthy"""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with read_only():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def replica_binds(urls, engine_options):
+    return {
+        f"{REPLICA_BIND_PREFIX}{index}": {"url": url, **engine_options}
+        for index, url in enumerate(urls)
+    }
+
+
+class ReplicaMonitor:
+    """Caches the replication lag of each replica for a short interval"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lag = {}
+
+    def lag(self, key, engine, check_interval):
+        now = time.monotonic()
+        with self._lock:
+            checked = self._lag.get(key)
+        if checked and now - checked[0] < check_interval:
+            return checked[1]
+
+        lag = self._measure(engine)
+        with self._lock:
+            self._lag[key] = (now, lag)
+        return lag
+
+    @staticmethod
+    def _measure(engine):
+        try:
+            with engine.connect() as connection:
+                return float(connection.execute(LAG_QUERY).scalar() or 0)
+        except SQLAlchemyError:
+            # An unreachable replica is treated as infinitely behind
+            return float("inf")
+
+
+replica_monitor = ReplicaMonitor()
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica inside ``replica_reads`` calls.
+
+    Flushes, DML and locking selects always go to the primary, and so does
+    everything else when every replica lags more than the configured limit.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _read_only.get() and self._is_plain_read(clause):
+            replica = self._pick_replica()
+            if replica is not None:
+                return replica
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _is_plain_read(self, clause):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            return False
+        return getattr(clause, "_for_update_arg", None) is None
+
+    def _pick_replica(self):
+        engines = self._db.engines
+        # Keep reading from the same source for the life of the session, so
+        # the queries of one request (a version check and the rows it
+        # describes) see the same replica. None means the primary.
+        if PINNED_REPLICA_KEY in self.info:
+            key = self.info[PINNED_REPLICA_KEY]
+            return None if key is None else engines[key]
+
+        keys = [
+            key
+            for key in engines
+            if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX)
+        ]
+        if not keys:
+            return None
+
+        config = current_app.config
+        random.shuffle(keys)
+        self.info[PINNED_REPLICA_KEY] = None
+        for key in keys:
+            lag = replica_monitor.lag(
+                key, engines[key], config["DB_REPLICA_CHECK_INTERVAL"]
+            )
+            if lag <= config["DB_REPLICA_MAX_LAG_SECONDS"]:
+                self.info[PINNED_REPLICA_KEY] = key
+                return engines[key]
+
+        return None
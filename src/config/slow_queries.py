@@ -0,0 +1,166 @@
+import queue
+import random
+import re
+import sys
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import Select, TextClause
+
+EXPLAIN_KEY = "slow_query_explain"
+EXPLAIN_QUEUE_SIZE = 16
+# Only plain reads are re-run: EXPLAIN ANALYZE executes the statement
+EXPLAINABLE = ("select", "with")
+# Row locks, and writes hidden in a CTE, that a re-run would repeat
+NOT_EXPLAINABLE = re.compile(
+    r"\b(insert|update|delete|merge)\b|\bfor\s+(key\s+)?share\b",
+    re.IGNORECASE,
+)
+
+
+def is_plain_read(statement, context):
+    """True when re-running ``statement`` can neither write nor take locks.
+
+    Compiled statements must be a ``Select`` without FOR UPDATE/SHARE. Raw
+    SQL, and as a second check the text of any statement, must start like a
+    read and contain no DML keyword or locking clause.
+    """
+    if context is not None:
+        if context.isinsert or context.isupdate or context.isdelete:
+            return False
+        compiled = getattr(context.compiled, "statement", None)
+        if compiled is not None and not isinstance(compiled, TextClause):
+            if not isinstance(compiled, Select) or compiled._for_update_arg is not None:
+                return False
+
+    return statement.lstrip().lower().startswith(EXPLAINABLE) and not (
+        NOT_EXPLAINABLE.search(statement)
+    )
+
+
+def parameter_shape(parameters, executemany=False):
+    """Types of the bound parameters, never their values"""
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def calling_controller():
+    """``Class.method`` of the innermost controller frame on the stack"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith("src.controllers."):
+            # The concrete controller, not the base class defining the method
+            instance = frame.f_locals.get("self")
+            if instance is not None:
+                return f"{type(instance).__name__}.{frame.f_code.co_name}"
+            # co_qualname is Python 3.11+, fall back to the bare name on 3.10
+            code = frame.f_code
+            return getattr(code, "co_qualname", code.co_name)
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """Bounded ring of statements slower than ``threshold_ms``.
+
+    A ``explain_rate`` fraction of slow reads on PostgreSQL is re-run under
+    EXPLAIN (ANALYZE, BUFFERS) by a background thread, on a connection of
+    its own, and the plan is attached to the entry.
+    """
+
+    def __init__(self, threshold_ms=250, size=200, explain_rate=0.0):
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=size)
+        self._explains = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+        self._explainer = None
+        self.threshold_ms = threshold_ms
+        self.explain_rate = explain_rate
+
+    def configure(self, threshold_ms, size, explain_rate):
+        with self._lock:
+            self._entries = deque(maxlen=size)
+        self.threshold_ms = threshold_ms
+        self.explain_rate = explain_rate
+
+    @property
+    def enabled(self):
+        return self.threshold_ms > 0 and self._entries.maxlen > 0
+
+    def record(self, conn, statement, parameters, context, executemany, seconds):
+        duration_ms = seconds * 1000
+        if not self.enabled or duration_ms < self.threshold_ms:
+            return
+        if conn.info.get(EXPLAIN_KEY):
+            return
+
+        entry = {
+            "statement": statement,
+            "parameters": parameter_shape(parameters, executemany),
+            "controller": calling_controller(),
+            "duration_ms": round(duration_ms, 3),
+            "at": datetime.now(timezone.utc).isoformat(),
+            "plan": None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+        if (
+            not executemany
+            and conn.dialect.name == "postgresql"
+            and is_plain_read(statement, context)
+            and random.random() < self.explain_rate
+        ):
+            self._queue_explain(conn.engine, statement, parameters, entry)
+
+    def entries(self):
+        """Newest first"""
+        with self._lock:
+            return [dict(entry) for entry in reversed(self._entries)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _queue_explain(self, engine, statement, parameters, entry):
+        if self._explainer is None or not self._explainer.is_alive():
+            self._explainer = threading.Thread(
+                target=self._explain_forever, name="slow-query-explain", daemon=True
+            )
+            self._explainer.start()
+        try:
+            self._explains.put_nowait((engine, statement, parameters, entry))
+        except queue.Full:
+            # Plans are a sample; dropping one is better than piling up work
+            pass
+
+    def _explain_forever(self):
+        while True:
+            engine, statement, parameters, entry = self._explains.get()
+            try:
+                with engine.connect() as connection:
+                    connection.info[EXPLAIN_KEY] = True
+                    try:
+                        plan = connection.exec_driver_sql(
+                            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}",
+                            parameters,
+                        ).scalar()
+                    finally:
+                        connection.info.pop(EXPLAIN_KEY, None)
+                        # Never keep anything the statement might have done
+                        connection.rollback()
+                with self._lock:
+                    entry["plan"] = plan
+            except SQLAlchemyError as e:
+                with self._lock:
+                    entry["plan"] = {"error": str(e)}
+
+
+slow_queries = SlowQueryLog()
@@ -0,0 +1,95 @@
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.cache import album_cache, barcode_cache, invalidation
+from src.config.api import api
+from src.config.database import db
+from src.config.instrumentation import endpoint_stats
+from src.config.metrics import pool_gauges, registry
+
+
+def prepare_for_fork(app):
+    """Work done once in the parent process and shared by every forked worker"""
+    with app.test_client() as client:
+        # flask-restx builds and caches the Swagger schema on first request
+        client.get(f"{api.prefix}/swagger.json")
+
+    # Workers report their own traffic, not the requests made above or the
+    # files of a previous run
+    endpoint_stats.clear()
+    registry.reset()
+    registry.clear_directory()
+
+
+def start_metrics_flusher(app):
+    """Publish this worker's metrics for the others to merge, see METRICS_DIR"""
+
+    def gauges():
+        with app.app_context():
+            return pool_gauges(db.engines)
+
+    registry.start_flusher(gauges)
+
+
+def start_cache_invalidation(app):
+    """Drop this worker's cached entries when another worker commits a change.
+
+    Needs PostgreSQL LISTEN/NOTIFY. On other databases a worker cannot hear
+    about the others' commits, so the caches are turned off instead.
+    """
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name == "postgresql":
+        invalidation.start(engine)
+    else:
+        album_cache.configure(0, 0, 0)
+        barcode_cache.configure(0, 0)
+
+
+def dispose_engines(app):
+    """Forget connections inherited from the parent process.
+
+    ``close=False`` leaves the parent's sockets alone; the child only drops
+    its references and opens connections of its own.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def warm_up(app, connections):
+    """Open up to ``connections`` pooled connections per engine and load caches.
+
+    Returns what was warmed, for logging. A failing engine (a replica that
+    is down) is reported and skipped; it should not keep a worker from
+    starting.
+    """
+    report = {"connections": {}, "errors": {}}
+    with app.app_context():
+        for key, engine in db.engines.items():
+            name = key or "primary"
+            size = getattr(engine.pool, "size", None)
+            count = min(connections, size()) if size else 1
+            opened = []
+            try:
+                # Held together, so the pool really ends up with ``count``
+                for _ in range(count):
+                    connection = engine.connect()
+                    opened.append(connection)
+                    connection.execute(text("SELECT 1"))
+                report["connections"][name] = count
+            except SQLAlchemyError as e:
+                report["errors"][name] = str(e)
+            finally:
+                for connection in opened:
+                    connection.close()
+
+        try:
+            catalog = album_cache.get_catalog()
+            report["albums"] = len(catalog.items) if catalog else 0
+        except SQLAlchemyError as e:
+            report["errors"]["album_cache"] = str(e)
+        finally:
+            db.session.remove()
+
+    return report
@@ -1,13 +1,165 @@
+from uuid import UUID
+from sqlalchemy import func, or_, select
+from bisect import bisect_right
+from sqlalchemy.exc import SQLAlchemyError
+from src.cache import album_cache
 from src.models.album import Album
+from src.models.album_availability import AlbumAvailability
+from src.models.inventory_item import VALID_STATUSES
 from src.validators import AlbumValidator
-from .base_controller import BaseController
+from .base_controller import (
+    BaseController,
+    conditional,
+    decode_cursor,
+    encode_cursor,
+    etag_for,
+    get_page_args,
+    page_etag,
+)
 from src.config.database import db
+from src.config.replicas import replica_reads
+
+
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+MAX_AVAILABILITY_ALBUMS = 500
+
+
+def _empty_counts():
+    return dict.fromkeys(VALID_STATUSES, 0)
+
+
+def availability_statement(album_ids):
+    """Aggregate rows of ``album_ids``, never a scan of inventory_items"""
+    return (
+        select(
+            AlbumAvailability.album_id,
+            AlbumAvailability.store_id,
+            AlbumAvailability.status,
+            AlbumAvailability.item_count,
+        )
+        .where(
+            AlbumAvailability.album_id.in_(set(album_ids)),
+            AlbumAvailability.item_count > 0,
+        )
+        .order_by(AlbumAvailability.album_id, AlbumAvailability.store_id)
+    )
+
+
+def summarize_availability(album_ids, rows):
+    """Fold aggregate rows into one summary per album, in ``album_ids`` order"""
+    summaries = {
+        album_id: {
+            "album_id": str(album_id),
+            "total": 0,
+            "counts": _empty_counts(),
+            "stores": {},
+        }
+        for album_id in album_ids
+    }
+    for album_id, store_id, status, item_count in rows:
+        summary = summaries[album_id]
+        store = summary["stores"].setdefault(
+            store_id,
+            {"store_id": str(store_id), "total": 0, "counts": _empty_counts()},
+        )
+        for entry in (summary, store):
+            entry["total"] += item_count
+            entry["counts"][status] += item_count
+
+    result = []
+    for album_id in album_ids:
+        summary = dict(summaries[album_id])
+        summary["stores"] = list(summary["stores"].values())
+        result.append(summary)
+    return result
 
 
 class AlbumController(BaseController):
     def __init__(self):
         super().__init__(Album)
 
+    def get_all(self):
+        """Page through the cached catalog snapshot, same cursors as the database"""
+        try:
+            cursor, limit = get_page_args()
+            catalog = album_cache.get_catalog()
+            if catalog is None:
+                return super().get_all()
+
+            start = 0
+            if cursor:
+                start = bisect_right(catalog.keys, decode_cursor(cursor))
+            end = start + limit
+            next_cursor = None
+            if end < len(catalog.keys):
+                next_cursor = encode_cursor(*catalog.keys[end - 1])
+            page = {
+                "items": catalog.items[start:end],
+                "limit": limit,
+                "next_cursor": next_cursor,
+            }
+
+            # Same tag as the page read from the database
+            etag = page_etag(
+                Album.__tablename__,
+                page,
+                lambda album: (album["id"], album["updated_at"]),
+            )
+            return conditional(etag, lambda: page, weak=True)
+        except ValueError as e:
+            return {"error": "Invalid pagination parameters", "details": str(e)}, 400
+        except SQLAlchemyError as e:
+            return {"error": "Database error occurred", "details": str(e)}, 500
+
+    def get_by_id(self, record_id):
+        try:
+            album = album_cache.get(record_id)
+            if not album:
+                return {"error": "Record not found"}, 404
+
+            etag = etag_for(Album.__tablename__, album["id"], album["updated_at"])
+            return conditional(etag, lambda: album)
+        except SQLAlchemyError as e:
+            return {"error": "Database error occurred", "details": str(e)}, 500
+
+    def get_availability(self, album_id):
+        """Copies of one album per store and status"""
+        try:
+            if not album_cache.get(album_id):
+                return {"error": "Album not found"}, 404
+            return self._availability([UUID(str(album_id))])[0], 200
+        except SQLAlchemyError as e:
+            return {"error": "Database error occurred", "details": str(e)}, 500
+
+    def get_availability_bulk(self, album_ids):
+        """Copies per store and status for many albums, in request order"""
+        try:
+            if not isinstance(album_ids, list) or not album_ids:
+                raise ValueError("album_ids must be a non-empty list")
+            if len(album_ids) > MAX_AVAILABILITY_ALBUMS:
+                raise ValueError(
+                    f"At most {MAX_AVAILABILITY_ALBUMS} albums per request"
+                )
+            try:
+                album_ids = [UUID(str(album_id)) for album_id in album_ids]
+            except ValueError:
+                raise ValueError("album_ids must contain valid UUIDs")
+
+            return self._availability(album_ids), 200
+        except ValueError as e:
+            return {"error": "Invalid input", "details": str(e)}, 400
+        except SQLAlchemyError as e:
+            return {"error": "Database error occurred", "details": str(e)}, 500
+
+    @replica_reads
+    def _availability(self, album_ids):
+        rows = db.session.execute(availability_statement(album_ids)).all()
+        return summarize_availability(album_ids, rows)
+
+    def get_cache_stats(self):
+        return album_cache.stats()
+
     def create_album(self, title, rental_price, artist, genre):
         try:
             album = Album(
@@ -32,6 +184,7 @@ class AlbumController(BaseController):
         except Exception as e:
             raise Exception(f"Error retrieving album: {str(e)}")
 
+    @replica_reads
     def get_all_albums(self):
         try:
             return Album.query.all()
@@ -81,29 +234,81 @@ class AlbumController(BaseController):
             db.session.rollback()
             raise Exception(f"Error deleting album: {str(e)}")
 
-    def search_albums(self, title=None, artist=None, genre=None):
+    @replica_reads
+    def search_albums(
+        self, q=None, title=None, artist=None, genre=None, limit=SEARCH_LIMIT
+    ):
+        """Search the catalog, best matches first
+
+        `q` is matched against title, artist and genre through the full-text
+        index, with typo-tolerant trigram matches on title and artist. The
+        field filters are substring matches served by the trigram indexes.
+        SQLite has neither index: it falls back to substring matching ordered
+        by title, which is enough for test runs.
+        """
+        if limit < 1 or limit > MAX_SEARCH_LIMIT:
+            raise ValueError(f"Limit must be between 1 and {MAX_SEARCH_LIMIT}")
+
         try:
+            postgres = db.engine.dialect.name == "postgresql"
             query = Album.query
+            filters = [
+                (column, term)
+                for column, term in (
+                    (Album.title, title),
+                    (Album.artist, artist),
+                    (Album.genre, genre),
+                )
+                if term
+            ]
+            for column, term in filters:
+                query = query.filter(column.ilike(f"%{term}%"))
 
-            if title:
-                query = query.filter(Album.title.ilike(f"%{title}%"))
-            if artist:
-                query = query.filter(Album.artist.ilike(f"%{artist}%"))
-            if genre:
-                query = query.filter(Album.genre.ilike(f"%{genre}%"))
+            if q and postgres:
+                document = Album.search_document()
+                tsquery = func.websearch_to_tsquery(Album.search_config(), q)
+                query = query.filter(
+                    or_(
+                        document.op("@@")(tsquery),
+                        Album.title.op("%")(q),
+                        Album.artist.op("%")(q),
+                    )
+                )
+                rank = func.ts_rank(document, tsquery) + func.greatest(
+                    func.similarity(Album.title, q), func.similarity(Album.artist, q)
+                )
+                query = query.order_by(rank.desc(), Album.id)
+            elif q:
+                pattern = f"%{q}%"
+                query = query.filter(
+                    or_(
+                        Album.title.ilike(pattern),
+                        Album.artist.ilike(pattern),
+                        Album.genre.ilike(pattern),
+                    )
+                ).order_by(Album.title, Album.id)
+            elif filters and postgres:
+                rank = sum(func.similarity(column, term) for column, term in filters)
+                query = query.order_by(rank.desc(), Album.id)
+            else:
+                query = query.order_by(Album.title, Album.id)
 
-            return query.all()
+            return query.limit(limit).all()
         except Exception as e:
             raise Exception(f"Error searching albums: {str(e)}")
 
-    def get_albums_by_artist(self, artist):
+    def get_albums_by_artist(self, artist, limit=SEARCH_LIMIT):
         try:
-            return Album.query.filter(Album.artist.ilike(f"%{artist}%")).all()
+            return self.search_albums(artist=artist, limit=limit)
+        except ValueError as e:
+            raise e
         except Exception as e:
             raise Exception(f"Error retrieving albums by artist: {str(e)}")
 
-    def get_albums_by_genre(self, genre):
+    def get_albums_by_genre(self, genre, limit=SEARCH_LIMIT):
         try:
-            return Album.query.filter(Album.genre.ilike(f"%{genre}%")).all()
+            return self.search_albums(genre=genre, limit=limit)
+        except ValueError as e:
+            raise e
         except Exception as e:
             raise Exception(f"Error retrieving albums by genre: {str(e)}")
@@ -1,5 +1,7 @@
 from flask import request
-from src.controllers.base_controller import BaseController
+from sqlalchemy.orm import contains_eager, raiseload
+from src.config.replicas import replica_reads
+from src.controllers.base_controller import BaseController, conditional
 from src.models.attendant import Attendant
 from src.models.person import Person
 from src.models.store import Store
@@ -12,32 +14,29 @@ class AttendantController(BaseController):
 
     def _validate_create_data(self, data):
         errors = []
+        references = self._load_references(store=(Store, data.get("store_id")))
 
         # Validate store_id
         if not data.get("store_id"):
             errors.append("Store ID is required")
-        else:
-            # Check if store exists
-            store = Store.query.get(data["store_id"])
-            if not store:
-                errors.append("Store not found")
+        elif not references["store"]:
+            errors.append("Store not found")
 
-        return {"valid": len(errors) == 0, "errors": errors}
+        return {"valid": len(errors) == 0, "errors": errors, "references": references}
 
-    def _validate_update_data(self, data, item):
+    def _validate_update_data(self, data, item, references=None):
         errors = []
+        if references is None:
+            references = self._load_references(store=(Store, data.get("store_id")))
 
         # Validate store_id if provided
         if "store_id" in data:
             if not data["store_id"]:
                 errors.append("Store ID is required")
-            else:
-                # Check if store exists
-                store = Store.query.get(data["store_id"])
-                if not store:
-                    errors.append("Store not found")
+            elif not references["store"]:
+                errors.append("Store not found")
 
-        return {"valid": len(errors) == 0, "errors": errors}
+        return {"valid": len(errors) == 0, "errors": errors, "references": references}
 
     def create(self):
         try:
@@ -78,16 +77,24 @@ class AttendantController(BaseController):
 
     def update(self, attendant_id):
         try:
-            attendant = Attendant.query.get(attendant_id)
+            data = request.get_json()
+            store_id = data.get("store_id") if isinstance(data, dict) else None
+
+            # Attendant, person and the new store, in one query
+            references = self._load_references(
+                attendant=(Attendant, attendant_id),
+                person=(Person, attendant_id),
+                store=(Store, store_id),
+            )
+            attendant = references["attendant"]
             if not attendant:
                 return {"error": "Attendant not found"}, 404
 
-            data = request.get_json()
             if not data:
                 return {"error": "No data provided"}, 400
 
             # Validate data
-            validation = self._validate_update_data(data, attendant)
+            validation = self._validate_update_data(data, attendant, references)
             if not validation["valid"]:
                 return {
                     "error": "Validation failed",
@@ -95,7 +102,7 @@ class AttendantController(BaseController):
                 }, 400
 
             # Update person data if provided
-            person = Person.query.get(attendant.person_id)
+            person = references["person"]
             if not person:
                 return {"error": "Person not found"}, 404
 
@@ -122,23 +129,26 @@ class AttendantController(BaseController):
         except Exception as e:
             return {"error": "An error occurred", "details": str(e)}, 500
 
-    def get_all(self):
-        try:
-            # Get all attendants with their person data
-            attendants = Attendant.query.join(Person).all()
-            return [attendant.to_dict() for attendant in attendants]
-        except Exception as e:
-            return {"error": "Database error occurred", "details": str(e)}, 500
+    def _etag_parts(self, attendant):
+        # Person fields are part of the payload, so their updates count too
+        return attendant.person_id, attendant.updated_at, attendant.person.updated_at
+
+    def _list_query(self):
+        # Load each attendant's person in the same query instead of once per row
+        return Attendant.query.join(Attendant.person).options(
+            contains_eager(Attendant.person), raiseload("*")
+        )
 
+    @replica_reads
     def get_by_id(self, attendant_id):
         try:
             # Get attendant with person data
             attendant = (
-                Attendant.query.join(Person).filter_by(person_id=attendant_id).first()
+                self._list_query().filter(Attendant.person_id == attendant_id).first()
             )
             if not attendant:
                 return {"error": "Attendant not found"}, 404
-            return attendant.to_dict()
+            return conditional(self._etag_for(attendant), attendant.to_dict)
         except Exception as e:
             return {"error": "Database error occurred", "details": str(e)}, 500
 
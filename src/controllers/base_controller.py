@@ -1,26 +1,165 @@
-from flask import request
+import base64
+import hashlib
+import json
+from datetime import datetime
+from uuid import UUID
+
+from flask import Response, request, stream_with_context
+from werkzeug.http import quote_etag
+from sqlalchemy import inspect, literal, select, tuple_
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import aliased, raiseload
 
 from src.config.database import db
+from src.config.replicas import read_only, replica_reads
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 1000
+
+
+def encode_cursor(sort_value, record_id):
+    payload = json.dumps([sort_value.isoformat(), str(record_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, record_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), UUID(record_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def get_page_args(args=None):
+    """Read ``cursor`` and ``limit`` from the query string, or from ``args``"""
+    if args is None:
+        args = request.args
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("Limit must be an integer")
+    if limit < 1:
+        raise ValueError("Limit must be greater than zero")
+
+    return args.get("cursor"), min(limit, MAX_PAGE_SIZE)
+
+
+def apply_keyset(query, sort_column, id_column, cursor, limit):
+    """Order by (sort_column, id_column) and seek past the cursor.
+
+    One extra row is fetched so the caller can tell whether a next page exists.
+    """
+    if cursor:
+        query = query.filter(tuple_(sort_column, id_column) > decode_cursor(cursor))
+
+    return query.order_by(sort_column, id_column).limit(limit + 1)
+
+
+def build_page(items, limit, cursor_for):
+    """Trim the look-ahead row and build the page payload"""
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = cursor_for(items[-1])
+
+    return {"items": items, "limit": limit, "next_cursor": next_cursor}
+
+
+def wants_ndjson():
+    """True when the client asked for newline-delimited JSON over plain JSON"""
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def stream_ndjson(query):
+    """Stream ``query`` as one JSON object per line.
+
+    Rows come from a server-side cursor in batches of STREAM_BATCH_SIZE and
+    are serialized as they arrive, so memory stays flat however many rows
+    match. The response bypasses flask-restx marshalling.
+    """
+
+    def generate():
+        with read_only():
+            for record in query.yield_per(STREAM_BATCH_SIZE):
+                yield json.dumps(record.to_dict()) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+
+def etag_for(*parts):
+    """Hash ``parts`` into an entity tag, datetimes by their ISO form"""
+    text = ":".join(
+        part.isoformat() if isinstance(part, datetime) else str(part) for part in parts
+    )
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def page_etag(table, page, parts_for):
+    """Entity tag of a page built by ``build_page``, from its own rows.
+
+    ``parts_for(record)`` gives the values that change whenever the record's
+    payload does, e.g. its id and ``updated_at``. Only the rows on the page
+    are hashed, so tagging costs no query beyond the page itself.
+    """
+    parts = [part for record in page["items"] for part in parts_for(record)]
+    return etag_for(table, page["limit"], page["next_cursor"], *parts)
+
+
+def conditional(etag, build, weak=False):
+    """Answer 304 when the client already holds ``etag``.
+
+    Otherwise return ``build()`` with the ETag header. ``build`` is only
+    called on a miss, so a 304 costs no serialization.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak)
+        return response
+
+    return build(), 200, {"ETag": quote_etag(etag, weak)}
 
 
 class BaseController:
     def __init__(self, model_class):
         self.model_class = model_class
+        self.id_column = inspect(model_class).primary_key[0]
 
+    @replica_reads
     def get_all(self):
         try:
-            records = self.model_class.query.all()
-            return [record.to_dict() for record in records]
+            cursor, limit = get_page_args()
+            query = apply_keyset(
+                self._list_query(),
+                self.model_class.created_at,
+                self.id_column,
+                cursor,
+                limit,
+            )
+            page = build_page(query.all(), limit, self._cursor_for)
+            etag = page_etag(self.model_class.__tablename__, page, self._etag_parts)
+
+            def build():
+                page["items"] = [record.to_dict() for record in page["items"]]
+                return page
+
+            return conditional(etag, build, weak=True)
+        except ValueError as e:
+            return {"error": "Invalid pagination parameters", "details": str(e)}, 400
         except SQLAlchemyError as e:
             return {"error": "Database error occurred", "details": str(e)}, 500
 
+    @replica_reads
     def get_by_id(self, record_id):
         try:
             record = self.model_class.query.get(record_id)
             if not record:
                 return {"error": "Record not found"}, 404
-            return record.to_dict()
+            return conditional(self._etag_for(record), record.to_dict)
         except SQLAlchemyError as e:
             return {"error": "Database error occurred", "details": str(e)}, 500
 
@@ -95,7 +234,56 @@ class BaseController:
             db.session.rollback()
             return {"error": "Database error occurred", "details": str(e)}, 500
 
+    def _load_references(self, **references):
+        """Fetch every row a request refers to in a single query.
+
+        ``references`` maps names to ``(model, id)`` pairs. Each row is LEFT
+        JOINed to a one-row anchor, so one round trip returns all rows that
+        exist. Returns a dict of name -> instance, with None for ids that
+        are malformed or not found.
+        """
+        loaded = dict.fromkeys(references)
+        lookups = []
+        for name, (model, record_id) in references.items():
+            try:
+                if not isinstance(record_id, UUID):
+                    record_id = UUID(str(record_id))
+            except ValueError:
+                continue
+            lookups.append((name, model, aliased(model), record_id))
+
+        if not lookups:
+            return loaded
+
+        # Selecting the anchor keeps the row even when no entity matched
+        anchor = select(literal(1).label("anchor")).subquery()
+        statement = select(
+            anchor.c.anchor, *(alias for _, _, alias, _ in lookups)
+        ).select_from(anchor)
+        for _, model, alias, record_id in lookups:
+            primary_key = inspect(model).primary_key[0]
+            statement = statement.outerjoin(
+                alias, getattr(alias, primary_key.key) == record_id
+            )
+
+        row = db.session.execute(statement).one()
+        loaded.update(zip((name for name, _, _, _ in lookups), row[1:]))
+        return loaded
+
     # Overridable methods
+    def _list_query(self):
+        # Serializers only read columns; fail loudly instead of lazy loading per row
+        return self.model_class.query.options(raiseload("*"))
+
+    def _etag_parts(self, record):
+        return getattr(record, self.id_column.key), record.updated_at
+
+    def _etag_for(self, record):
+        return etag_for(self.model_class.__tablename__, *self._etag_parts(record))
+
+    def _cursor_for(self, record):
+        return encode_cursor(record.created_at, getattr(record, self.id_column.key))
+
     def _apply_filters(self, query, filters):
         return query
 
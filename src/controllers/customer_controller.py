@@ -1,5 +1,7 @@
 from flask import request
-from src.controllers.base_controller import BaseController
+from sqlalchemy.orm import contains_eager, raiseload
+from src.config.replicas import replica_reads
+from src.controllers.base_controller import BaseController, conditional
 from src.models.customer import Customer
 from src.models.person import Person
 from src.validators.person_validator import PersonValidator
@@ -70,23 +72,26 @@ class CustomerController(BaseController):
         except Exception as e:
             return {"error": "An error occurred", "details": str(e)}, 500
 
-    def get_all(self):
-        try:
-            # Get all customers with their person data
-            customers = Customer.query.join(Person).all()
-            return [customer.to_dict() for customer in customers]
-        except Exception as e:
-            return {"error": "Database error occurred", "details": str(e)}, 500
+    def _etag_parts(self, customer):
+        # Person fields are part of the payload, so their updates count too
+        return customer.person_id, customer.updated_at, customer.person.updated_at
+
+    def _list_query(self):
+        # Load each customer's person in the same query instead of once per row
+        return Customer.query.join(Customer.person).options(
+            contains_eager(Customer.person), raiseload("*")
+        )
 
+    @replica_reads
     def get_by_id(self, customer_id):
         try:
             # Get customer with person data
             customer = (
-                Customer.query.join(Person).filter_by(person_id=customer_id).first()
+                self._list_query().filter(Customer.person_id == customer_id).first()
             )
             if not customer:
                 return {"error": "Customer not found"}, 404
-            return customer.to_dict()
+            return conditional(self._etag_for(customer), customer.to_dict)
         except Exception as e:
             return {"error": "Database error occurred", "details": str(e)}, 500
 
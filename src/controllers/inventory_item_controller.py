@@ -1,19 +1,61 @@
+from collections import Counter
+from uuid import uuid4
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from src.cache import album_cache, barcode_cache
+from src.models.album_availability import apply_availability_deltas
 from src.models.inventory_item import InventoryItem
 from src.models.album import Album
 from src.models.store import Store
-from src.validators import InventoryItemValidator
-from .base_controller import BaseController
+from src.validators import InventoryItemValidator, ValidationError
+from .base_controller import BaseController, etag_for
 from src.config.database import db
+from src.config.replicas import replica_reads
+
+
+MAX_BULK_ITEMS = 5000
 
 
 class InventoryItemController(BaseController):
     def __init__(self):
         super().__init__(InventoryItem)
 
+    @staticmethod
+    def transition_status(item_id, from_status, to_status):
+        """Move an item from ``from_status`` to ``to_status`` with one UPDATE.
+
+        The conditional UPDATE locks the row until the caller commits; a
+        concurrent transition of the same item waits for that lock and then
+        finds the status already changed. Returns the item's barcode, or None
+        when the item does not exist or is not in ``from_status``.
+        """
+        item = db.session.execute(
+            update(InventoryItem)
+            .where(InventoryItem.id == item_id, InventoryItem.status == from_status)
+            .values(status=to_status)
+            .returning(
+                InventoryItem.barcode, InventoryItem.album_id, InventoryItem.store_id
+            )
+            .execution_options(synchronize_session="fetch")
+        ).first()
+        if item is None:
+            return None
+
+        # Core statements bypass the ORM listeners that keep these in step
+        barcode_cache.invalidate_on_commit(db.session, item.barcode)
+        apply_availability_deltas(
+            db.session.connection(),
+            {
+                (item.album_id, item.store_id, from_status): -1,
+                (item.album_id, item.store_id, to_status): 1,
+            },
+        )
+        return item.barcode
+
     def create_inventory_item(self, barcode, album_id, store_id, status="available"):
         try:
             # Verify album and store exist
-            album = Album.query.get(album_id)
+            album = album_cache.get(album_id)
             if not album:
                 raise ValueError(f"Album with ID {album_id} not found")
 
@@ -34,6 +76,107 @@ class InventoryItemController(BaseController):
             db.session.rollback()
             raise Exception(f"Error creating inventory item: {str(e)}")
 
+    def bulk_create_inventory_items(self, items):
+        """Validate a batch of items in memory and insert the valid ones at once.
+
+        Album, store and barcode checks take one IN query each, and all rows
+        are inserted with a single executemany in one transaction. Returns
+        one result per input row, in input order.
+        """
+        if not isinstance(items, list) or not items:
+            raise ValueError("Items must be a non-empty list")
+        if len(items) > MAX_BULK_ITEMS:
+            raise ValueError(f"A batch can have at most {MAX_BULK_ITEMS} items")
+
+        results = []
+        candidates = []
+        for index, data in enumerate(items):
+            try:
+                if not isinstance(data, dict):
+                    raise ValidationError(["Item must be an object"])
+                validated = InventoryItemValidator.validate_inventory_item_data(
+                    data.get("barcode"),
+                    data.get("album_id"),
+                    data.get("store_id"),
+                    data.get("status", "available"),
+                )
+            except ValidationError as e:
+                results.append({"index": index, "status": "error", "errors": e.errors})
+                continue
+            except (AttributeError, TypeError):
+                results.append(
+                    {"index": index, "status": "error", "errors": ["Invalid item data"]}
+                )
+                continue
+
+            results.append(None)
+            candidates.append((index, validated))
+
+        try:
+            album_ids = {row["album_id"] for _, row in candidates}
+            store_ids = {row["store_id"] for _, row in candidates}
+            barcodes = {row["barcode"] for _, row in candidates}
+            existing_albums = set(
+                db.session.scalars(select(Album.id).where(Album.id.in_(album_ids)))
+            )
+            existing_stores = set(
+                db.session.scalars(select(Store.id).where(Store.id.in_(store_ids)))
+            )
+            taken_barcodes = set(
+                db.session.scalars(
+                    select(InventoryItem.barcode).where(
+                        InventoryItem.barcode.in_(barcodes)
+                    )
+                )
+            )
+
+            rows = []
+            batch_barcodes = set()
+            for index, row in candidates:
+                errors = []
+                if row["album_id"] not in existing_albums:
+                    errors.append(f"Album with ID {row['album_id']} not found")
+                if row["store_id"] not in existing_stores:
+                    errors.append(f"Store with ID {row['store_id']} not found")
+                if row["barcode"] in taken_barcodes:
+                    errors.append(f"Barcode {row['barcode']} already exists")
+                elif row["barcode"] in batch_barcodes:
+                    errors.append(f"Barcode {row['barcode']} is repeated in the batch")
+
+                if errors:
+                    results[index] = {"index": index, "status": "error", "errors": errors}
+                    continue
+
+                batch_barcodes.add(row["barcode"])
+                row["id"] = uuid4()
+                rows.append(row)
+                results[index] = {
+                    "index": index,
+                    "status": "created",
+                    "id": str(row["id"]),
+                    "barcode": row["barcode"],
+                }
+
+            if rows:
+                db.session.execute(insert(InventoryItem), rows)
+                apply_availability_deltas(
+                    db.session.connection(),
+                    Counter(
+                        (row["album_id"], row["store_id"], row["status"])
+                        for row in rows
+                    ),
+                )
+            db.session.commit()
+            return results
+        except IntegrityError:
+            db.session.rollback()
+            raise ValueError(
+                "Batch conflicts with items created concurrently, please retry"
+            )
+        except Exception as e:
+            db.session.rollback()
+            raise Exception(f"Error creating inventory items: {str(e)}")
+
     def get_inventory_item_by_id(self, item_id):
         try:
             item = InventoryItem.query.get(item_id)
@@ -44,38 +187,60 @@ class InventoryItemController(BaseController):
             raise Exception(f"Error retrieving inventory item: {str(e)}")
 
     def get_inventory_item_by_barcode(self, barcode):
+        """Scan lookup, served from the barcode cache as a ScannedItem"""
         try:
-            item = InventoryItem.query.filter(InventoryItem.barcode == barcode).first()
-            if not item:
-                raise ValueError(f"Inventory item with barcode {barcode} not found")
-            return item
+            item = barcode_cache.get(barcode)
         except Exception as e:
             raise Exception(f"Error retrieving inventory item: {str(e)}")
+        if not item:
+            raise ValueError(f"Inventory item with barcode {barcode} not found")
+        return item
 
+    @replica_reads
     def get_all_inventory_items(self):
         try:
             return InventoryItem.query.all()
         except Exception as e:
             raise Exception(f"Error retrieving inventory items: {str(e)}")
 
+    @replica_reads
     def get_inventory_items_by_store(self, store_id):
         try:
             return InventoryItem.query.filter(InventoryItem.store_id == store_id).all()
         except Exception as e:
             raise Exception(f"Error retrieving inventory items by store: {str(e)}")
 
+    @replica_reads
+    def get_store_inventory_etag(self, store_id):
+        try:
+            count, last_update = (
+                db.session.query(
+                    func.count(InventoryItem.id), func.max(InventoryItem.updated_at)
+                )
+                .filter(InventoryItem.store_id == store_id)
+                .one()
+            )
+            return etag_for(
+                InventoryItem.__tablename__, store_id, count, last_update
+            )
+        except Exception as e:
+            raise Exception(f"Error retrieving store inventory version: {str(e)}")
+
+    @replica_reads
     def get_inventory_items_by_album(self, album_id):
         try:
             return InventoryItem.query.filter(InventoryItem.album_id == album_id).all()
         except Exception as e:
             raise Exception(f"Error retrieving inventory items by album: {str(e)}")
 
+    @replica_reads
     def get_inventory_items_by_status(self, status):
         try:
             return InventoryItem.query.filter(InventoryItem.status == status).all()
         except Exception as e:
             raise Exception(f"Error retrieving inventory items by status: {str(e)}")
 
+    @replica_reads
     def get_available_items(self, album_id=None, store_id=None):
         try:
             query = InventoryItem.query.filter(InventoryItem.status == "available")
@@ -117,7 +282,7 @@ class InventoryItemController(BaseController):
                 item.barcode = InventoryItemValidator.validate_barcode(barcode)
             if album_id is not None:
                 # Verify album exists
-                album = Album.query.get(album_id)
+                album = album_cache.get(album_id)
                 if not album:
                     raise ValueError(f"Album with ID {album_id} not found")
                 item.album_id = InventoryItemValidator.validate_album_id(album_id)
@@ -157,18 +322,16 @@ class InventoryItemController(BaseController):
             db.session.rollback()
             raise Exception(f"Error deleting inventory item: {str(e)}")
 
-    def rent_item(self, item_id):       
+    def rent_item(self, item_id):
         try:
-            item = self.get_inventory_item_by_id(item_id)
-
-            if item.status != "available":
+            if not self.transition_status(item_id, "available", "rented"):
+                item = self.get_inventory_item_by_id(item_id)
                 raise ValueError(
                     f"Item is not available for rental (current status: {item.status})"
                 )
 
-            item.status = "rented"
             db.session.commit()
-            return item
+            return self.get_inventory_item_by_id(item_id)
         except ValueError as e:
             db.session.rollback()
             raise e
@@ -176,18 +339,16 @@ class InventoryItemController(BaseController):
             db.session.rollback()
             raise Exception(f"Error renting item: {str(e)}")
 
-    def return_item(self, item_id): 
+    def return_item(self, item_id):
         try:
-            item = self.get_inventory_item_by_id(item_id)
-
-            if item.status != "rented":
+            if not self.transition_status(item_id, "rented", "available"):
+                item = self.get_inventory_item_by_id(item_id)
                 raise ValueError(
                     f"Item is not currently rented (current status: {item.status})"
                 )
 
-            item.status = "available"
             db.session.commit()
-            return item
+            return self.get_inventory_item_by_id(item_id)
         except ValueError as e:
             db.session.rollback()
             raise e
@@ -1,12 +1,42 @@
 from datetime import datetime
+from uuid import UUID
 from flask import request
-from src.controllers.base_controller import BaseController
+from sqlalchemy import Date, cast, func, select
+from src.config.database import db
+from src.config.replicas import replica_reads
+from src.controllers.base_controller import (
+    BaseController,
+    stream_ndjson,
+    wants_ndjson,
+)
+from src.models.inventory_item import InventoryItem
 from src.models.payment import Payment
 from src.models.rental import Rental
 from src.validators import PaymentValidator, ValidationError
 
 VALID_PAYMENT_METHODS = ["cash", "credit_card", "debit_card", "pix"]
 VALID_PAYMENT_STATUSES = ["pending", "completed", "failed", "refunded"]
+REPORT_PERIODS = ["day", "week", "month"]
+REPORT_GROUPS = REPORT_PERIODS + ["store", "method", "status"]
+
+
+def _parse_report_date(value, name):
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid {name} date format. Use ISO format (YYYY-MM-DD)")
+
+
+def _period_bucket(period, dialect):
+    """Expression for the first day of the payment's day, week or month"""
+    if dialect == "postgresql":
+        return cast(func.date_trunc(period, Payment.payment_date), Date)
+    # SQLite has no date_trunc, weeks start on Monday like in PostgreSQL
+    if period == "day":
+        return func.date(Payment.payment_date)
+    if period == "week":
+        return func.date(Payment.payment_date, "weekday 0", "-6 days")
+    return func.strftime("%Y-%m-01", Payment.payment_date)
 
 
 class PaymentController(BaseController):
@@ -22,7 +52,7 @@ class PaymentController(BaseController):
             # Validate rental_id
             if not data.get("rental_id"):
                 return {"error": "Rental ID is required"}, 400
-            if not Rental.query.get(data["rental_id"]):
+            if not self._load_references(rental=(Rental, data["rental_id"]))["rental"]:
                 return {"error": "Rental not found"}, 400
 
             # Validate payment_date if provided
@@ -61,11 +91,17 @@ class PaymentController(BaseController):
 
     def update(self, payment_id):
         try:
-            payment = Payment.query.get(payment_id)
+            data = request.get_json()
+            rental_id = data.get("rental_id") if isinstance(data, dict) else None
+
+            # The payment and the rental it moves to, in one query
+            references = self._load_references(
+                payment=(Payment, payment_id), rental=(Rental, rental_id)
+            )
+            payment = references["payment"]
             if not payment:
                 return {"error": "Payment not found"}, 404
 
-            data = request.get_json()
             if not data:
                 return {"error": "No data provided"}, 400
 
@@ -73,7 +109,7 @@ class PaymentController(BaseController):
             if "rental_id" in data:
                 if not data["rental_id"]:
                     return {"error": "Rental ID is required"}, 400
-                if not Rental.query.get(data["rental_id"]):
+                if not references["rental"]:
                     return {"error": "Rental not found"}, 400
                 payment.rental_id = data["rental_id"]
             if "amount" in data:
@@ -145,6 +181,7 @@ class PaymentController(BaseController):
         except Exception as e:
             return {"error": "An error occurred", "details": str(e)}, 500
 
+    @replica_reads
     def get_payments_by_status(self, status):
         """Get payments by status"""
         try:
@@ -156,11 +193,16 @@ class PaymentController(BaseController):
                     400,
                 )
 
-            payments = Payment.query.filter_by(status=status).all()
+            query = Payment.query.filter_by(status=status)
+            if wants_ndjson():
+                return stream_ndjson(query)
+
+            payments = query.all()
             return [payment.to_dict() for payment in payments], 200
         except Exception as e:
             return {"error": "Database error occurred", "details": str(e)}, 500
 
+    @replica_reads
     def get_payments_by_method(self, method):
         """Get payments by payment method"""
         try:
@@ -172,7 +214,103 @@ class PaymentController(BaseController):
                     400,
                 )
 
-            payments = Payment.query.filter_by(payment_method=method).all()
+            query = Payment.query.filter_by(payment_method=method)
+            if wants_ndjson():
+                return stream_ndjson(query)
+
+            payments = query.all()
             return [payment.to_dict() for payment in payments], 200
         except Exception as e:
             return {"error": "Database error occurred", "details": str(e)}, 500
+
+    @replica_reads
+    def get_revenue_report(self):
+        """Payment count and amount grouped by period, store, method or status"""
+        try:
+            groups = [
+                group.strip()
+                for group in request.args.get("group_by", "month").split(",")
+                if group.strip()
+            ]
+            invalid = [group for group in groups if group not in REPORT_GROUPS]
+            if invalid or not groups:
+                raise ValueError(
+                    f'Invalid group_by. Use any of: {", ".join(REPORT_GROUPS)}'
+                )
+            periods = [group for group in groups if group in REPORT_PERIODS]
+            if len(periods) > 1:
+                raise ValueError("Group by at most one of day, week or month")
+
+            columns = {
+                "store": InventoryItem.store_id,
+                "method": Payment.payment_method,
+                "status": Payment.status,
+            }
+            if periods:
+                dialect = db.engine.dialect.name
+                columns[periods[0]] = _period_bucket(periods[0], dialect)
+            keys = [columns[group].label(group) for group in groups]
+
+            query = select(
+                *keys,
+                func.count(Payment.id).label("count"),
+                func.coalesce(func.sum(Payment.amount), 0).label("total"),
+            ).select_from(Payment)
+
+            store_id = request.args.get("store_id")
+            if "store" in groups or store_id:
+                query = query.join(Payment.rental).join(Rental.item)
+            if store_id:
+                query = query.where(InventoryItem.store_id == UUID(store_id))
+
+            if request.args.get("from"):
+                start = _parse_report_date(request.args["from"], "from")
+                query = query.where(Payment.payment_date >= start)
+            if request.args.get("to"):
+                end = _parse_report_date(request.args["to"], "to")
+                query = query.where(Payment.payment_date < end)
+
+            status = request.args.get("status")
+            if status:
+                if status not in VALID_PAYMENT_STATUSES:
+                    raise ValueError(
+                        f'Invalid status. Must be one of: {", ".join(VALID_PAYMENT_STATUSES)}'
+                    )
+                query = query.where(Payment.status == status)
+            method = request.args.get("method")
+            if method:
+                if method not in VALID_PAYMENT_METHODS:
+                    raise ValueError(
+                        f'Invalid payment method. Must be one of: {", ".join(VALID_PAYMENT_METHODS)}'
+                    )
+                query = query.where(Payment.payment_method == method)
+
+            query = query.group_by(*keys).order_by(*keys)
+
+            rows = []
+            for row in db.session.execute(query).mappings():
+                entry = {}
+                for group in groups:
+                    value = row[group]
+                    if group == "store":
+                        value = str(value)
+                    elif group in REPORT_PERIODS and not isinstance(value, str):
+                        value = value.isoformat()
+                    entry[group] = value
+                entry["count"] = row["count"]
+                entry["total"] = float(row["total"])
+                rows.append(entry)
+
+            return (
+                {
+                    "group_by": groups,
+                    "rows": rows,
+                    "count": sum(row["count"] for row in rows),
+                    "total": round(sum(row["total"] for row in rows), 2),
+                },
+                200,
+            )
+        except ValueError as e:
+            return {"error": "Invalid report parameters", "details": str(e)}, 400
+        except Exception as e:
+            return {"error": "Database error occurred", "details": str(e)}, 500
@@ -1,10 +1,26 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
 from flask import request
-from src.controllers.base_controller import BaseController
+from src.config.database import db
+from src.config.replicas import replica_reads
+from src.controllers.base_controller import (
+    BaseController,
+    apply_keyset,
+    build_page,
+    encode_cursor,
+    get_page_args,
+    stream_ndjson,
+    wants_ndjson,
+)
+from src.controllers.inventory_item_controller import InventoryItemController
 from src.models.rental import Rental
+from src.models.album import Album
 from src.models.customer import Customer
 from src.models.inventory_item import InventoryItem
 from src.models.attendant import Attendant
+from src.models.person import Person
+
+DEFAULT_OVERDUE_DAYS = 7
 
 
 class RentalController(BaseController):
@@ -13,32 +29,29 @@ class RentalController(BaseController):
 
     def _validate_create_data(self, data):
         errors = []
+        references = self._load_references(
+            customer=(Customer, data.get("customer_id")),
+            item=(InventoryItem, data.get("item_id")),
+            attendant=(Attendant, data.get("attendant_id")),
+        )
 
         # Validate customer_id
         if not data.get("customer_id"):
             errors.append("Customer ID is required")
-        else:
-            customer = Customer.query.get(data["customer_id"])
-            if not customer:
-                errors.append("Customer not found")
+        elif not references["customer"]:
+            errors.append("Customer not found")
 
-        # Validate item_id
+        # Validate item_id; availability is settled atomically by create
         if not data.get("item_id"):
             errors.append("Item ID is required")
-        else:
-            item = InventoryItem.query.get(data["item_id"])
-            if not item:
-                errors.append("Inventory item not found")
-            elif item.status != "available":
-                errors.append("Inventory item is not available for rental")
+        elif not references["item"]:
+            errors.append("Inventory item not found")
 
         # Validate attendant_id
         if not data.get("attendant_id"):
             errors.append("Attendant ID is required")
-        else:
-            attendant = Attendant.query.get(data["attendant_id"])
-            if not attendant:
-                errors.append("Attendant not found")
+        elif not references["attendant"]:
+            errors.append("Attendant not found")
 
         # Validate rental_date if provided
         if "rental_date" in data and data["rental_date"]:
@@ -70,39 +83,45 @@ class RentalController(BaseController):
                     "Invalid return date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)"
                 )
 
-        return {"valid": len(errors) == 0, "errors": errors}
+        return {"valid": len(errors) == 0, "errors": errors, "references": references}
 
     def _validate_update_data(self, data, rental):
         errors = []
+        fields = {
+            "customer": (Customer, "customer_id"),
+            "item": (InventoryItem, "item_id"),
+            "attendant": (Attendant, "attendant_id"),
+        }
+        references = self._load_references(
+            **{
+                name: (model, data[field])
+                for name, (model, field) in fields.items()
+                if data.get(field)
+            }
+        )
 
         # Validate customer_id if provided
         if "customer_id" in data:
             if not data["customer_id"]:
                 errors.append("Customer ID is required")
-            else:
-                customer = Customer.query.get(data["customer_id"])
-                if not customer:
-                    errors.append("Customer not found")
+            elif not references["customer"]:
+                errors.append("Customer not found")
 
         # Validate item_id if provided
         if "item_id" in data:
             if not data["item_id"]:
                 errors.append("Item ID is required")
-            else:
-                item = InventoryItem.query.get(data["item_id"])
-                if not item:
-                    errors.append("Inventory item not found")
-                elif item.status != "available":
-                    errors.append("Inventory item is not available for rental")
+            elif not references["item"]:
+                errors.append("Inventory item not found")
+            elif references["item"].status != "available":
+                errors.append("Inventory item is not available for rental")
 
         # Validate attendant_id if provided
         if "attendant_id" in data:
             if not data["attendant_id"]:
                 errors.append("Attendant ID is required")
-            else:
-                attendant = Attendant.query.get(data["attendant_id"])
-                if not attendant:
-                    errors.append("Attendant not found")
+            elif not references["attendant"]:
+                errors.append("Attendant not found")
 
         # Validate rental_date if provided
         if "rental_date" in data and data["rental_date"]:
@@ -134,7 +153,7 @@ class RentalController(BaseController):
                     "Invalid return date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)"
                 )
 
-        return {"valid": len(errors) == 0, "errors": errors}
+        return {"valid": len(errors) == 0, "errors": errors, "references": references}
 
     def create(self):
         try:
@@ -169,23 +188,24 @@ class RentalController(BaseController):
                     data["return_date"].replace("Z", "+00:00")
                 )
 
-            # Create new rental
-            rental = Rental(**rental_data)
+            # Claim the item and record the rental in one transaction, the
+            # conditional UPDATE keeps two terminals from renting the same copy
+            if not InventoryItemController.transition_status(
+                data["item_id"], "available", "rented"
+            ):
+                db.session.rollback()
+                return {"error": "Inventory item is not available for rental"}, 409
 
-            # Update inventory item status to "rented"
-            item = InventoryItem.query.get(data["item_id"])
-            if item:
-                item.status = "rented"
-
-            # Add to database
-            rental.save()
-            if item:
-                item.save()
+            rental = Rental(**rental_data)
+            db.session.add(rental)
+            db.session.commit()
 
             return rental.to_dict(), 201
         except ValueError as e:
+            db.session.rollback()
             return {"error": "Invalid data provided", "details": str(e)}, 400
         except Exception as e:
+            db.session.rollback()
             return {"error": "An error occurred", "details": str(e)}, 500
 
     def update(self, rental_id):
@@ -236,40 +256,116 @@ class RentalController(BaseController):
     def return_rental(self, rental_id):
         """Mark a rental as returned"""
         try:
-            rental = Rental.query.get(rental_id)
+            # Lock the rental so a concurrent return cannot run twice
+            rental = (
+                Rental.query.filter(Rental.id == rental_id).with_for_update().first()
+            )
             if not rental:
+                db.session.rollback()
                 return {"error": "Rental not found"}, 404
 
             if rental.is_returned():
+                db.session.rollback()
                 return {"error": "Rental already returned"}, 400
 
-            # Mark rental as returned
             rental.mark_as_returned()
 
-            # Update inventory item status back to "available"
-            item = InventoryItem.query.get(rental.item_id)
-            if item:
-                item.status = "available"
-                item.save()
-
-            rental.save()
+            # Put the item back on the shelf unless it changed status meanwhile
+            # (e.g. it was marked as damaged)
+            InventoryItemController.transition_status(
+                rental.item_id, "rented", "available"
+            )
+            db.session.commit()
 
             return rental.to_dict(), 200
         except Exception as e:
+            db.session.rollback()
             return {"error": "An error occurred", "details": str(e)}, 500
 
+    @replica_reads
     def get_active_rentals(self):
         """Get all active (not returned) rentals"""
         try:
-            active_rentals = Rental.query.filter(Rental.return_date.is_(None)).all()  # type: ignore
+            query = Rental.query.filter(Rental.return_date.is_(None))  # type: ignore
+            if wants_ndjson():
+                return stream_ndjson(query)
+
+            active_rentals = query.all()
             return [rental.to_dict() for rental in active_rentals], 200
         except Exception as e:
             return {"error": "Database error occurred", "details": str(e)}, 500
 
+    @replica_reads
     def get_returned_rentals(self):
         """Get all returned rentals"""
         try:
-            returned_rentals = Rental.query.filter(Rental.return_date.isnot(None)).all()  # type: ignore
+            query = Rental.query.filter(Rental.return_date.isnot(None))  # type: ignore
+            if wants_ndjson():
+                return stream_ndjson(query)
+
+            returned_rentals = query.all()
             return [rental.to_dict() for rental in returned_rentals], 200
         except Exception as e:
             return {"error": "Database error occurred", "details": str(e)}, 500
+
+    @replica_reads
+    def get_overdue_rentals(self):
+        """Open rentals older than ``days``, oldest first, with album and customer"""
+        try:
+            cursor, limit = get_page_args()
+            try:
+                days = int(request.args.get("days", DEFAULT_OVERDUE_DAYS))
+            except ValueError:
+                raise ValueError("Days must be an integer")
+            if days < 0:
+                raise ValueError("Days must not be negative")
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+            # Names come from the same query, no lookup per rental
+            query = (
+                db.session.query(
+                    Rental,
+                    InventoryItem.store_id,
+                    InventoryItem.barcode,
+                    Album.title,
+                    Album.artist,
+                    Person.name,
+                    Person.phone,
+                )
+                .join(InventoryItem, Rental.item_id == InventoryItem.id)
+                .join(Album, InventoryItem.album_id == Album.id)
+                .join(Person, Rental.customer_id == Person.id)
+                .filter(Rental.return_date.is_(None), Rental.rental_date < cutoff)
+            )
+            if request.args.get("store_id"):
+                try:
+                    store_id = UUID(request.args["store_id"])
+                except ValueError:
+                    raise ValueError("Invalid store_id")
+                query = query.filter(InventoryItem.store_id == store_id)
+
+            rows = apply_keyset(
+                query, Rental.rental_date, Rental.id, cursor, limit
+            ).all()
+            page = build_page(
+                rows, limit, lambda row: encode_cursor(row[0].rental_date, row[0].id)
+            )
+
+            items = []
+            for rental, store_id, barcode, title, artist, name, phone in page["items"]:
+                item = rental.to_dict()
+                item.update(
+                    store_id=str(store_id),
+                    barcode=barcode,
+                    album_title=title,
+                    album_artist=artist,
+                    customer_name=name,
+                    customer_phone=Person.serializer_formatters["phone"](phone),
+                )
+                items.append(item)
+            page["items"] = items
+            return page, 200
+        except ValueError as e:
+            return {"error": "Invalid parameters", "details": str(e)}, 400
+        except Exception as e:
+            return {"error": "Database error occurred", "details": str(e)}, 500
@@ -6,6 +6,7 @@ from .address import Address
 from .attendant import Attendant
 from .album import Album
 from .inventory_item import InventoryItem
+from .album_availability import AlbumAvailability
 from .rental import Rental
 from .payment import Payment
 
@@ -18,6 +19,7 @@ __all__ = [
     'Attendant',
     'Album',
     'InventoryItem',
+    'AlbumAvailability',
     'Rental',
     'Payment'
 ] 
\ No newline at end of file
@@ -1,8 +1,17 @@
 from uuid import uuid4
-from sqlalchemy import CheckConstraint, Column, String, Uuid, ForeignKey
+from sqlalchemy import CheckConstraint, Column, String, ForeignKey
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 from src.validators import AddressValidator, ValidationError
+from .types import Uuid
+
+
+def _mask_zip_code(zip_code):
+    zip_str = str(zip_code)
+    if len(zip_str) == 8:
+        return f"{zip_str[:5]}-{zip_str[5:]}"
+
+    return zip_str
 
 
 class Address(BaseModel):
@@ -22,6 +31,8 @@ class Address(BaseModel):
     store = relationship("Store", back_populates="address")
     customer = relationship("Customer", back_populates="address")
 
+    serializer_formatters = {"zip_code": _mask_zip_code}
+
     __table_args__ = (
         CheckConstraint("length(street) >= 2", name="check_street_length"),
         CheckConstraint("length(number) >= 1", name="check_number_length"),
@@ -61,16 +72,7 @@ class Address(BaseModel):
             raise ValueError(str(e))
 
     def format_zip_code(self):
-        zip_str = str(self.zip_code)
-        if len(zip_str) == 8:
-            return f"{zip_str[:5]}-{zip_str[5:]}"
-
-        return zip_str
-
-    def to_dict(self, exclude_fields=None):
-        data = super().to_dict(exclude_fields)
-        data["zip_code"] = self.format_zip_code()
-        return data
+        return _mask_zip_code(self.zip_code)
 
     def __repr__(self):
         return f"<Address {self.street}, {self.number} - {self.city}/{self.state}>"
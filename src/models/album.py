@@ -1,8 +1,24 @@
 from uuid import uuid4
-from sqlalchemy import CheckConstraint, Column, String, Uuid, Numeric
+from sqlalchemy import (
+    DDL,
+    CheckConstraint,
+    Column,
+    Index,
+    String,
+    Numeric,
+    event,
+    func,
+    literal_column,
+)
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 from src.validators import AlbumValidator, ValidationError
+from .types import Uuid
+
+
+# Text search configuration without stemming, artist and title words are names
+SEARCH_CONFIG = "simple"
+TRIGRAM_COLUMNS = ("title", "artist", "genre")
 
 
 class Album(BaseModel):
@@ -39,14 +55,51 @@ class Album(BaseModel):
             # Convert ValidationError to ValueError for backward compatibility
             raise ValueError(str(e))
 
-    def to_dict(self, exclude_fields=None):
-        data = super().to_dict(exclude_fields)
+    def __repr__(self):
+        return f"<Album {self.title} - R$ {self.rental_price}>"
 
-        # Convert Decimal to float for JSON serialization
-        if "rental_price" in data and data["rental_price"] is not None:
-            data["rental_price"] = float(data["rental_price"])
+    @staticmethod
+    def search_config():
+        return literal_column(f"'{SEARCH_CONFIG}'::regconfig")
 
-        return data
+    @classmethod
+    def search_document(cls):
+        """Weighted tsvector over title, artist and genre (PostgreSQL only)
 
-    def __repr__(self):
-        return f"<Album {self.title} - R$ {self.rental_price}>"
+        The full-text index is built on this same expression, queries must use
+        it unchanged for the planner to pick the index.
+        """
+        config = cls.search_config()
+        weighted = [
+            func.setweight(
+                func.to_tsvector(config, column), literal_column(f"'{weight}'")
+            )
+            for column, weight in (
+                (cls.title, "A"),
+                (cls.artist, "B"),
+                (cls.genre, "C"),
+            )
+        ]
+        return weighted[0].op("||")(weighted[1]).op("||")(weighted[2])
+
+
+# Search indexes are PostgreSQL-specific, other dialects skip them
+Album.__table__.append_constraint(
+    Index(
+        "ix_albums_search_document", Album.search_document(), postgresql_using="gin"
+    ).ddl_if(dialect="postgresql")
+)
+
+for _name in TRIGRAM_COLUMNS:
+    Index(
+        f"ix_albums_{_name}_trgm",
+        getattr(Album, _name),
+        postgresql_using="gin",
+        postgresql_ops={_name: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
+event.listen(
+    Album.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,149 @@
+from collections import Counter
+from uuid import UUID
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    delete,
+    event,
+    func,
+    inspect,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from src.config.database import db
+from src.config.replicas import RoutingSession
+from .inventory_item import InventoryItem, status_enum
+from .types import Uuid
+
+UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class AlbumAvailability(db.Model):
+    """Number of copies of an album per store and status.
+
+    Maintained alongside inventory_items: ORM changes to items are applied by
+    the flush listener below, Core statements that change items must call
+    ``apply_availability_deltas`` in the same transaction. Rows that drop to
+    zero are deleted so they never hold back deleting an album or a store.
+    ``rebuild_album_availability`` recomputes it from scratch.
+    """
+
+    __tablename__ = "album_availability"
+
+    album_id = Column(
+        Uuid, ForeignKey("albums.id", ondelete="CASCADE"), primary_key=True
+    )
+    store_id = Column(
+        Uuid, ForeignKey("stores.id", ondelete="CASCADE"), primary_key=True
+    )
+    status = Column(status_enum, primary_key=True)
+    # No CHECK (item_count >= 0): a drifted counter should not fail a rental,
+    # readers skip non-positive counts and a rebuild repairs it
+    item_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<AlbumAvailability {self.album_id} @ {self.store_id} "
+            f"{self.status}: {self.item_count}>"
+        )
+
+
+def _as_uuid(value):
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def apply_availability_deltas(connection, deltas):
+    """Add ``deltas`` ({(album_id, store_id, status): change}) to the counts"""
+    rows = [
+        {
+            "album_id": _as_uuid(album_id),
+            "store_id": _as_uuid(store_id),
+            "status": status,
+            "item_count": change,
+        }
+        for (album_id, store_id, status), change in deltas.items()
+        if change
+    ]
+    if not rows:
+        return
+
+    # Always touch rows in the same order so concurrent transactions cannot
+    # deadlock on each other's counters
+    rows.sort(key=lambda row: (row["album_id"], row["store_id"], row["status"]))
+    table = AlbumAvailability.__table__
+    statement = UPSERTS[connection.dialect.name](table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.album_id, table.c.store_id, table.c.status],
+        set_={"item_count": table.c.item_count + statement.excluded.item_count},
+    )
+    connection.execute(statement, rows)
+
+    emptied = [
+        (row["album_id"], row["store_id"], row["status"])
+        for row in rows
+        if row["item_count"] < 0
+    ]
+    if emptied:
+        connection.execute(
+            delete(table).where(
+                tuple_(table.c.album_id, table.c.store_id, table.c.status).in_(
+                    emptied
+                ),
+                table.c.item_count <= 0,
+            )
+        )
+
+
+def rebuild_album_availability(session):
+    """Recompute every count from inventory_items"""
+    table = AlbumAvailability.__table__
+    session.execute(delete(table))
+    session.execute(
+        table.insert().from_select(
+            ["album_id", "store_id", "status", "item_count"],
+            select(
+                InventoryItem.album_id,
+                InventoryItem.store_id,
+                InventoryItem.status,
+                func.count(),
+            ).group_by(
+                InventoryItem.album_id, InventoryItem.store_id, InventoryItem.status
+            ),
+        )
+    )
+
+
+def _key_history(item):
+    """(album_id, store_id, status) before and after the pending change"""
+    state = inspect(item)
+    before, after = [], []
+    for name in ("album_id", "store_id", "status"):
+        # Loads expired attributes, the row still exists before the flush
+        history = state.attrs[name].load_history()
+        old = (history.deleted or history.unchanged or [None])[0]
+        new = (history.added or history.unchanged or [None])[0]
+        before.append(old)
+        after.append(new)
+    return tuple(before), tuple(after)
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _count_item_changes(session, flush_context, instances):
+    deltas = Counter()
+    for item in session.new:
+        if isinstance(item, InventoryItem):
+            deltas[_key_history(item)[1]] += 1
+    for item in session.dirty:
+        if isinstance(item, InventoryItem) and session.is_modified(item):
+            before, after = _key_history(item)
+            if before != after:
+                deltas[before] -= 1
+                deltas[after] += 1
+    for item in session.deleted:
+        if isinstance(item, InventoryItem):
+            deltas[_key_history(item)[0]] -= 1
+
+    if deltas:
+        apply_availability_deltas(session.connection(), deltas)
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Uuid, ForeignKey
+from sqlalchemy import Column, ForeignKey
 from sqlalchemy.orm import relationship
 from .base import BaseModel
+from .types import Uuid
 
 
 class Attendant(BaseModel):
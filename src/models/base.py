@@ -1,14 +1,14 @@
 from datetime import datetime, timezone
-from uuid import UUID
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, Index, event
 from src.config.database import db
+from .serializers import compile_serializer
 
 
 class BaseModel(db.Model):
     __abstract__ = True
 
-    created_at = Column(DateTime, default=datetime.now(timezone.utc), nullable=False)
-    updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
 
     def save(self):
         try:
@@ -27,24 +27,28 @@ class BaseModel(db.Model):
             raise e
 
     def to_dict(self, exclude_fields=None):
-        if exclude_fields is None:
-            exclude_fields = []
-
-        data = {}
-        for column in self.__table__.columns:  # type: ignore
-            if column.name not in exclude_fields:
-                value = getattr(self, column.name)
-                if isinstance(value, datetime):
-                    value = value.isoformat()
-                elif isinstance(value, UUID):
-                    value = str(value)
-                data[column.name] = value
-
-        return data
+        return self._serializer(self, exclude_fields)
 
     @classmethod
     def get_by_id(cls, id):
         return cls.query.filter_by(id=id).first()
     
     def __repr__(self):
-        return f'<{self.__class__.__name__} {getattr(self, "id", "")}>'
\ No newline at end of file
+        return f'<{self.__class__.__name__} {getattr(self, "id", "")}>'
+
+
+@event.listens_for(BaseModel, "after_mapper_constructed", propagate=True)
+def _attach_serializer(mapper, class_):
+    # Built once per model at import time, see serializers.compile_serializer
+    columns = list(mapper.local_table.columns)
+    class_._serializer = staticmethod(compile_serializer(class_, columns))
+
+
+@event.listens_for(BaseModel, "after_mapper_constructed", propagate=True)
+def _attach_keyset_index(mapper, class_):
+    # Lists are paginated on (created_at, primary key), see apply_keyset
+    table = mapper.local_table
+    pk = table.primary_key.columns[0]
+    table.append_constraint(
+        Index(f"ix_{table.name}_created_at_{pk.name}", table.c.created_at, pk)
+    )
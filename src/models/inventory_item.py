@@ -1,12 +1,14 @@
 from uuid import uuid4
-from sqlalchemy import CheckConstraint, Column, Enum, ForeignKey, String, Uuid
+from sqlalchemy import CheckConstraint, Column, Enum, ForeignKey, Index, String
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 from src.validators import InventoryItemValidator, ValidationError
+from .types import Uuid
 
 VALID_STATUSES = ["available", "rented", "maintenance", "damaged", "lost"]
 
-status_enum = Enum(*VALID_STATUSES, name="status_enum")
+# A native type on PostgreSQL, a CHECK on databases without enums (SQLite)
+status_enum = Enum(*VALID_STATUSES, name="status_enum", create_constraint=True)
 
 
 class InventoryItem(BaseModel):
@@ -25,6 +27,10 @@ class InventoryItem(BaseModel):
 
     __table_args__ = (
         CheckConstraint("length(barcode) >= 2", name="check_barcode_length"),
+        # Store and album listings, with or without a status filter
+        Index("ix_inventory_items_store_id_status", "store_id", "status"),
+        Index("ix_inventory_items_album_id_status", "album_id", "status"),
+        Index("ix_inventory_items_status", "status"),
     )
 
     def __init__(self, barcode, album_id, store_id, status):
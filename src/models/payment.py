@@ -3,21 +3,26 @@ from datetime import datetime, timezone
 from sqlalchemy import (
     CheckConstraint,
     Column,
-    Uuid,
     ForeignKey,
     DateTime,
     Numeric,
     Enum,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 from src.validators import PaymentValidator, ValidationError
+from .types import Uuid
 
 VALID_PAYMENT_METHODS = ["cash", "credit_card", "debit_card", "pix"]
 VALID_STATUSES = ["pending", "completed", "failed", "refunded"]
 
-payment_method_enum = Enum(*VALID_PAYMENT_METHODS, name="payment_method_enum")
-payment_status_enum = Enum(*VALID_STATUSES, name="payment_status_enum")
+payment_method_enum = Enum(
+    *VALID_PAYMENT_METHODS, name="payment_method_enum", create_constraint=True
+)
+payment_status_enum = Enum(
+    *VALID_STATUSES, name="payment_status_enum", create_constraint=True
+)
 
 
 class Payment(BaseModel):
@@ -26,7 +31,9 @@ class Payment(BaseModel):
     id = Column(Uuid, primary_key=True, default=uuid4)
     rental_id = Column(Uuid, ForeignKey("rentals.id"), nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
-    payment_date = Column(DateTime, nullable=False, default=datetime.now(timezone.utc))
+    payment_date = Column(
+        DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
     payment_method = Column(payment_method_enum, nullable=False)
     status = Column(payment_status_enum, nullable=False)
 
@@ -35,6 +42,11 @@ class Payment(BaseModel):
 
     __table_args__ = (
         CheckConstraint("amount > 0", name="check_payment_amount_positive"),
+        Index("ix_payments_rental_id", "rental_id"),
+        Index("ix_payments_status", "status"),
+        Index("ix_payments_payment_method", "payment_method"),
+        # Date ranges of the revenue reports
+        Index("ix_payments_payment_date", "payment_date"),
     )
 
     def __init__(
@@ -65,14 +77,5 @@ class Payment(BaseModel):
     def mark_as_failed(self):
         self.status = "failed"
 
-    def to_dict(self, exclude_fields=None):
-        data = super().to_dict(exclude_fields)
-
-        # Convert Decimal to float for JSON serialization
-        if "amount" in data and data["amount"] is not None:
-            data["amount"] = float(data["amount"])
-
-        return data
-
     def __repr__(self):
         return f"<Payment {self.payment_method} - R$ {self.amount} ({self.status})>"
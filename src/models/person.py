@@ -1,8 +1,23 @@
 from uuid import uuid4
-from sqlalchemy import CheckConstraint, Column, String, Uuid
+from sqlalchemy import CheckConstraint, Column, String
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 from src.validators import PersonValidator, ValidationError
+from .types import Uuid
+
+
+def _mask_cpf(cpf):
+    cpf_str = str(cpf)
+    if len(cpf_str) == 11:
+        return f"{cpf_str[:3]}.{cpf_str[3:6]}.{cpf_str[6:9]}-{cpf_str[9:]}"
+    return cpf_str
+
+
+def _mask_phone(phone):
+    phone_str = str(phone)
+    if len(phone_str) == 11:
+        return f"({phone_str[:2]}) {phone_str[2:3]} {phone_str[3:7]}-{phone_str[7:]}"
+    return phone_str
 
 
 class Person(BaseModel):
@@ -18,6 +33,8 @@ class Person(BaseModel):
     customer = relationship("Customer", back_populates="person", uselist=False, cascade="all, delete-orphan")
     attendant = relationship("Attendant", back_populates="person", uselist=False, cascade="all, delete-orphan")
 
+    serializer_formatters = {"cpf": _mask_cpf, "phone": _mask_phone}
+
     __table_args__ = (
         CheckConstraint("length(cpf) = 11", name="check_person_cpf_length"),
         CheckConstraint("length(name) >= 2", name="check_person_name_length"),
@@ -40,23 +57,10 @@ class Person(BaseModel):
             raise ValueError(str(e))
 
     def format_cpf(self):
-        cpf_str = str(self.cpf)
-        if len(cpf_str) == 11:
-            return f"{cpf_str[:3]}.{cpf_str[3:6]}.{cpf_str[6:9]}-{cpf_str[9:]}"
-        return cpf_str
+        return _mask_cpf(self.cpf)
 
     def format_phone(self):
-        phone_str = str(self.phone)
-        if len(phone_str) == 11:
-            return f"({phone_str[:2]}) {phone_str[2:3]} {phone_str[3:7]}-{phone_str[7:]}"
-        return phone_str
-
-    def to_dict(self, exclude_fields=None):
-        data = super().to_dict(exclude_fields)
-
-        data["cpf"] = self.format_cpf()
-        data["phone"] = self.format_phone()
-        return data
+        return _mask_phone(self.phone)
 
     def __repr__(self):
         return f"<Person {self.name} - {self.cpf}>"
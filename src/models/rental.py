@@ -1,8 +1,9 @@
 from uuid import uuid4
 from datetime import datetime, timezone
-from sqlalchemy import Column, Uuid, ForeignKey, DateTime
+from sqlalchemy import Column, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
+from .types import Uuid
 
 
 class Rental(BaseModel):
@@ -12,7 +13,7 @@ class Rental(BaseModel):
     customer_id = Column(Uuid, ForeignKey('customers.person_id'), nullable=False)
     item_id = Column(Uuid, ForeignKey('inventory_items.id'), nullable=False)
     attendant_id = Column(Uuid, ForeignKey('attendants.person_id'), nullable=False)
-    rental_date = Column(DateTime, nullable=False, default=datetime.now(timezone.utc))
+    rental_date = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     return_date = Column(DateTime, nullable=True)
 
     # Relationships
@@ -21,6 +22,23 @@ class Rental(BaseModel):
     attendant = relationship('Attendant', back_populates='rentals')
     payments = relationship('Payment', back_populates='rental', lazy='dynamic')
 
+    # Only open rentals are indexed, so the overdue list stays small and fast
+    # however much returned history accumulates
+    __table_args__ = (
+        Index(
+            'ix_rentals_open_rental_date',
+            'rental_date',
+            'id',
+            postgresql_where=return_date.is_(None),
+            sqlite_where=return_date.is_(None),
+        ),
+        Index('ix_rentals_customer_id', 'customer_id'),
+        Index('ix_rentals_attendant_id', 'attendant_id'),
+        # Whether an item is out: its rentals with no return date
+        Index('ix_rentals_item_id_return_date', 'item_id', 'return_date'),
+        Index('ix_rentals_return_date', 'return_date'),
+    )
+
     def __init__(self, customer_id, item_id, attendant_id, rental_date=None, return_date=None):
         self.customer_id = customer_id
         self.item_id = item_id
@@ -1,9 +1,18 @@
 import re
 from uuid import uuid4
-from sqlalchemy import CheckConstraint, Column, String, Uuid
+from sqlalchemy import CheckConstraint, Column, String
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 from src.validators import StoreValidator, ValidationError
+from .types import Uuid
+
+
+def _mask_cnpj(cnpj):
+    cnpj_str = str(cnpj)
+    if len(cnpj_str) == 14:
+        return f"{cnpj_str[:2]}.{cnpj_str[2:5]}.{cnpj_str[5:8]}/{cnpj_str[8:12]}-{cnpj_str[12:]}"
+
+    return cnpj_str
 
 
 class Store(BaseModel):
@@ -18,6 +27,8 @@ class Store(BaseModel):
     address = relationship("Address", back_populates="store", uselist=False)
     inventory_items = relationship("InventoryItem", back_populates="store", lazy="dynamic")
 
+    serializer_formatters = {"cnpj": _mask_cnpj}
+
     __table_args__ = (
         CheckConstraint("length(cnpj) = 14", name="check_cnpj_length"),
         CheckConstraint("length(trade_name) >= 2", name="check_trade_name_length"),
@@ -35,16 +46,7 @@ class Store(BaseModel):
             raise ValueError(str(e))
 
     def format_cnpj(self):
-        cnpj_str = str(self.cnpj)
-        if len(cnpj_str) == 14:
-            return f"{cnpj_str[:2]}.{cnpj_str[2:5]}.{cnpj_str[5:8]}/{cnpj_str[8:12]}-{cnpj_str[12:]}"
-
-        return cnpj_str
-
-    def to_dict(self, exclude_fields=None):
-        data = super().to_dict(exclude_fields)
-        data["cnpj"] = self.format_cnpj()
-        return data
+        return _mask_cnpj(self.cnpj)
 
     def __repr__(self):
         return f"<Store {self.trade_name} - {self.cnpj}>"
@@ -152,6 +152,21 @@ inventory_item_model = api.model(
     },
 )
 
+# Inventory Item scan model, what a barcode lookup returns
+inventory_item_scan_model = api.model(
+    "InventoryItemScan",
+    {
+        "id": fields.String(description="Inventory Item UUID"),
+        "barcode": fields.String(description="Item barcode"),
+        "album_id": fields.String(description="Album UUID"),
+        "store_id": fields.String(description="Store UUID"),
+        "status": fields.String(
+            description="Item status",
+            enum=["available", "rented", "maintenance", "damaged", "lost"],
+        ),
+    },
+)
+
 # Inventory Item input model
 inventory_item_input_model = api.model(
     "InventoryItemInput",
@@ -260,6 +275,142 @@ payment_input_model = api.model(
     },
 )
 
+# Paginated list models
+def page_model(item_model):
+    return api.model(
+        f"{item_model.name}Page",
+        {
+            "items": fields.List(fields.Nested(item_model), description="Page items"),
+            "limit": fields.Integer(description="Maximum number of items per page"),
+            "next_cursor": fields.String(
+                description="Cursor for the next page, null on the last page"
+            ),
+        },
+    )
+
+
+customer_page_model = page_model(customer_model)
+address_page_model = page_model(address_model)
+album_page_model = page_model(album_model)
+store_page_model = page_model(store_model)
+inventory_item_page_model = page_model(inventory_item_model)
+attendant_page_model = page_model(attendant_model)
+rental_page_model = page_model(rental_model)
+payment_page_model = page_model(payment_model)
+
+# Overdue rental model, a rental with what staff need to chase it
+overdue_rental_model = api.clone(
+    "OverdueRental",
+    rental_model,
+    {
+        "store_id": fields.String(description="Store UUID"),
+        "barcode": fields.String(description="Item barcode"),
+        "album_title": fields.String(description="Album title"),
+        "album_artist": fields.String(description="Album artist"),
+        "customer_name": fields.String(description="Customer name"),
+        "customer_phone": fields.String(description="Customer phone"),
+    },
+)
+overdue_rental_page_model = page_model(overdue_rental_model)
+
+# Bulk inventory intake models
+inventory_item_bulk_input_model = api.model(
+    "InventoryItemBulkInput",
+    {
+        "items": fields.List(
+            fields.Nested(inventory_item_input_model),
+            required=True,
+            description="Items to create, at most 5000 per batch",
+        ),
+    },
+)
+
+inventory_item_bulk_result_model = api.model(
+    "InventoryItemBulkResult",
+    {
+        "index": fields.Integer(description="Position of the item in the batch"),
+        "status": fields.String(
+            description="Outcome for the item", enum=["created", "error"]
+        ),
+        "id": fields.String(description="UUID of the created item"),
+        "barcode": fields.String(description="Normalized barcode"),
+        "errors": fields.List(fields.String, description="Validation errors"),
+    },
+)
+
+inventory_item_bulk_response_model = api.model(
+    "InventoryItemBulkResponse",
+    {
+        "created": fields.Integer(description="Number of items created"),
+        "failed": fields.Integer(description="Number of items rejected"),
+        "results": fields.List(fields.Nested(inventory_item_bulk_result_model)),
+    },
+)
+
+# Album availability models
+status_counts_model = api.model(
+    "StatusCounts",
+    {
+        status: fields.Integer(description=f"Copies {status}")
+        for status in ["available", "rented", "maintenance", "damaged", "lost"]
+    },
+)
+
+store_availability_model = api.model(
+    "StoreAvailability",
+    {
+        "store_id": fields.String(description="Store UUID"),
+        "total": fields.Integer(description="Copies in the store"),
+        "counts": fields.Nested(status_counts_model),
+    },
+)
+
+album_availability_model = api.model(
+    "AlbumAvailability",
+    {
+        "album_id": fields.String(description="Album UUID"),
+        "total": fields.Integer(description="Copies across all stores"),
+        "counts": fields.Nested(status_counts_model),
+        "stores": fields.List(fields.Nested(store_availability_model)),
+    },
+)
+
+album_availability_query_model = api.model(
+    "AlbumAvailabilityQuery",
+    {
+        "album_ids": fields.List(
+            fields.String,
+            required=True,
+            description="Album UUIDs, at most 500 per request",
+        ),
+    },
+)
+
+# Payment report models
+payment_report_row_model = api.model(
+    "PaymentReportRow",
+    {
+        "day": fields.String(description="First day of the bucket, when grouped"),
+        "week": fields.String(description="Monday of the week, when grouped"),
+        "month": fields.String(description="First day of the month, when grouped"),
+        "store": fields.String(description="Store UUID, when grouped"),
+        "method": fields.String(description="Payment method, when grouped"),
+        "status": fields.String(description="Payment status, when grouped"),
+        "count": fields.Integer(description="Number of payments"),
+        "total": fields.Float(description="Sum of payment amounts"),
+    },
+)
+
+payment_report_model = api.model(
+    "PaymentReport",
+    {
+        "group_by": fields.List(fields.String, description="Grouping columns"),
+        "rows": fields.List(fields.Nested(payment_report_row_model)),
+        "count": fields.Integer(description="Number of payments in the report"),
+        "total": fields.Float(description="Sum of amounts in the report"),
+    },
+)
+
 # Error model
 error_model = api.model(
     "Error",
@@ -0,0 +1,21 @@
+from uuid import UUID
+
+from sqlalchemy import TypeDecorator
+from sqlalchemy import Uuid as BaseUuid
+
+
+class Uuid(TypeDecorator):
+    """``sqlalchemy.Uuid`` that also accepts ids as strings.
+
+    Routes and JSON bodies carry ids as text. PostgreSQL casts them on its
+    own; SQLite stores the 32 hex digits of a ``UUID`` and would compare a
+    string bound as is against nothing.
+    """
+
+    impl = BaseUuid
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return UUID(value)
+        return value
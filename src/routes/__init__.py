@@ -6,6 +6,8 @@ from .store_routes import store_ns
 from .inventory_item_routes import inventory_item_ns
 from .rental_routes import rental_ns
 from .payment_routes import payment_ns
+from .admin_routes import admin_ns
+from .metrics_routes import metrics_ns
 
 
 def register_namespaces(api_instance):
@@ -17,3 +19,5 @@ def register_namespaces(api_instance):
     api_instance.add_namespace(inventory_item_ns, path="/inventory-items")
     api_instance.add_namespace(rental_ns, path="/rentals")
     api_instance.add_namespace(payment_ns, path="/payments")
+    api_instance.add_namespace(admin_ns, path="/admin")
+    api_instance.add_namespace(metrics_ns, path="/metrics")
@@ -3,9 +3,11 @@ from src.controllers.address_controller import AddressController
 from src.models.swagger_models import (
     address_model,
     address_input_model,
+    address_page_model,
     error_model,
     success_model,
 )
+from src.routes.marshalling import marshal_with_passthrough
 
 # Create namespace for addresses
 address_ns = Namespace("addresses", description="Address operations")
@@ -15,8 +17,12 @@ address_controller = AddressController()
 @address_ns.route("")
 class AddressList(Resource):
     @address_ns.doc("get_all_addresses")
-    @address_ns.marshal_list_with(address_model)
-    @address_ns.response(200, "Success", [address_model])
+    @address_ns.param("limit", "Maximum number of items per page")
+    @address_ns.param("cursor", "Cursor returned as next_cursor by the previous page")
+    @marshal_with_passthrough(address_ns, address_page_model)
+    @address_ns.response(200, "Success", address_page_model)
+    @address_ns.response(304, "Not Modified")
+    @address_ns.response(400, "Invalid pagination parameters", error_model)
     @address_ns.response(500, "Internal Server Error", error_model)
     def get(self):
         """Get all addresses"""
@@ -36,8 +42,9 @@ class AddressList(Resource):
 @address_ns.param("address_id", "Address UUID")
 class Address(Resource):
     @address_ns.doc("get_address_by_id")
-    @address_ns.marshal_with(address_model)
+    @marshal_with_passthrough(address_ns, address_model)
     @address_ns.response(200, "Success", address_model)
+    @address_ns.response(304, "Not Modified")
     @address_ns.response(404, "Address not found", error_model)
     @address_ns.response(500, "Internal Server Error", error_model)
     def get(self, address_id):
@@ -0,0 +1,43 @@
+from flask_restx import Namespace, Resource
+from src.config.instrumentation import endpoint_stats
+from src.config.slow_queries import slow_queries
+from src.models.swagger_models import success_model
+
+# Create namespace for operational endpoints
+admin_ns = Namespace("admin", description="Operational insight into this process")
+
+
+@admin_ns.route("/instrumentation")
+class Instrumentation(Resource):
+    @admin_ns.doc("get_instrumentation")
+    @admin_ns.response(200, "Success")
+    def get(self):
+        """Get the slowest endpoints and requests served by this process"""
+        return endpoint_stats.report(), 200
+
+    @admin_ns.doc("reset_instrumentation")
+    @admin_ns.response(200, "Statistics cleared", success_model)
+    def delete(self):
+        """Clear the collected request statistics"""
+        endpoint_stats.clear()
+        return {"message": "Statistics cleared"}, 200
+
+
+@admin_ns.route("/slow-queries")
+class SlowQueries(Resource):
+    @admin_ns.doc("get_slow_queries")
+    @admin_ns.response(200, "Success")
+    def get(self):
+        """Get the latest statements slower than SLOW_QUERY_MS, newest first"""
+        return {
+            "threshold_ms": slow_queries.threshold_ms,
+            "explain_rate": slow_queries.explain_rate,
+            "queries": slow_queries.entries(),
+        }, 200
+
+    @admin_ns.doc("reset_slow_queries")
+    @admin_ns.response(200, "Slow queries cleared", success_model)
+    def delete(self):
+        """Clear the slow query log"""
+        slow_queries.clear()
+        return {"message": "Slow queries cleared"}, 200
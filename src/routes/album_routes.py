@@ -1,13 +1,17 @@
 from flask_restx import Namespace, Resource
 from flask import request
 from flask_restx.api import HTTPStatus
-from src.controllers.album_controller import AlbumController
+from src.controllers.album_controller import AlbumController, SEARCH_LIMIT
 from src.models.swagger_models import (
     album_model,
     album_input_model,
+    album_page_model,
+    album_availability_model,
+    album_availability_query_model,
     error_model,
     success_model,
 )
+from src.routes.marshalling import marshal_with_passthrough
 
 # Create namespace for albums
 album_ns = Namespace("albums", description="Album operations")
@@ -17,8 +21,12 @@ album_controller = AlbumController()
 @album_ns.route("")
 class AlbumList(Resource):
     @album_ns.doc("get_all_albums")
-    @album_ns.marshal_list_with(album_model)
-    @album_ns.response(200, "Success", [album_model])
+    @album_ns.param("limit", "Maximum number of items per page")
+    @album_ns.param("cursor", "Cursor returned as next_cursor by the previous page")
+    @marshal_with_passthrough(album_ns, album_page_model)
+    @album_ns.response(200, "Success", album_page_model)
+    @album_ns.response(304, "Not Modified")
+    @album_ns.response(400, "Invalid pagination parameters", error_model)
     @album_ns.response(500, "Internal Server Error", error_model)
     def get(self):
         """Get all albums"""
@@ -39,8 +47,9 @@ class AlbumList(Resource):
 @album_ns.param("album_id", "Album UUID")
 class Album(Resource):
     @album_ns.doc("get_album_by_id")
-    @album_ns.marshal_with(album_model)
+    @marshal_with_passthrough(album_ns, album_model)
     @album_ns.response(200, "Success", album_model)
+    @album_ns.response(304, "Not Modified")
     @album_ns.response(404, "Album not found", error_model)
     @album_ns.response(500, "Internal Server Error", error_model)
     def get(self, album_id):
@@ -67,26 +76,56 @@ class Album(Resource):
         return album_controller.delete(album_id)
 
 
+@album_ns.route("/<uuid:album_id>/availability")
+@album_ns.param("album_id", "Album UUID")
+class AlbumAvailability(Resource):
+    @album_ns.doc("get_album_availability")
+    @album_ns.response(200, "Success", album_availability_model)
+    @album_ns.response(404, "Album not found", error_model)
+    @album_ns.response(500, "Internal Server Error", error_model)
+    def get(self, album_id):
+        """Get copies of an album per store and status"""
+        return album_controller.get_availability(album_id)
+
+
+@album_ns.route("/availability")
+class AlbumAvailabilityBulk(Resource):
+    @album_ns.doc("get_albums_availability")
+    @album_ns.expect(album_availability_query_model)
+    @album_ns.response(200, "Success", [album_availability_model])
+    @album_ns.response(400, "Invalid input", error_model)
+    @album_ns.response(500, "Internal Server Error", error_model)
+    def post(self):
+        """Get copies of several albums per store and status"""
+        data = request.get_json(silent=True) or {}
+        return album_controller.get_availability_bulk(data.get("album_ids"))
+
+
 @album_ns.route("/search")
 class AlbumSearch(Resource):
     @album_ns.doc("search_albums")
+    @album_ns.param("q", "Search title, artist and genre, best matches first")
     @album_ns.param("title", "Search by album title")
     @album_ns.param("artist", "Search by artist name")
     @album_ns.param("genre", "Search by genre")
+    @album_ns.param("limit", "Maximum number of albums (default 20, max 100)")
     @album_ns.marshal_list_with(album_model)
     @album_ns.response(200, "Success", [album_model])
+    @album_ns.response(400, "Invalid limit", error_model)
     @album_ns.response(500, "Internal Server Error", error_model)
     def get(self):
         """Search albums by title, artist, or genre"""
         try:
-            title = request.args.get("title")
-            artist = request.args.get("artist")
-            genre = request.args.get("genre")
-
             albums = album_controller.search_albums(
-                title=title, artist=artist, genre=genre
+                q=request.args.get("q"),
+                title=request.args.get("title"),
+                artist=request.args.get("artist"),
+                genre=request.args.get("genre"),
+                limit=request.args.get("limit", SEARCH_LIMIT, type=int),
             )
-            return {"albums": [album.to_dict() for album in albums]}, 200
+            return [album.to_dict() for album in albums], 200
+        except ValueError as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": str(e)}, 500
 
@@ -95,14 +134,20 @@ class AlbumSearch(Resource):
 @album_ns.param("artist", "Artist name")
 class AlbumsByArtist(Resource):
     @album_ns.doc("get_albums_by_artist")
+    @album_ns.param("limit", "Maximum number of albums (default 20, max 100)")
     @album_ns.marshal_list_with(album_model)
     @album_ns.response(200, "Success", [album_model])
+    @album_ns.response(400, "Invalid limit", error_model)
     @album_ns.response(500, "Internal Server Error", error_model)
     def get(self, artist):
         """Get albums by artist"""
         try:
-            albums = album_controller.get_albums_by_artist(artist)
-            return {"albums": [album.to_dict() for album in albums]}, 200
+            albums = album_controller.get_albums_by_artist(
+                artist, limit=request.args.get("limit", SEARCH_LIMIT, type=int)
+            )
+            return [album.to_dict() for album in albums], 200
+        except ValueError as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": str(e)}, 500
 
@@ -111,13 +156,28 @@ class AlbumsByArtist(Resource):
 @album_ns.param("genre", "Genre name")
 class AlbumsByGenre(Resource):
     @album_ns.doc("get_albums_by_genre")
+    @album_ns.param("limit", "Maximum number of albums (default 20, max 100)")
     @album_ns.marshal_list_with(album_model)
     @album_ns.response(200, "Success", [album_model])
+    @album_ns.response(400, "Invalid limit", error_model)
     @album_ns.response(500, "Internal Server Error", error_model)
     def get(self, genre):
         """Get albums by genre"""
         try:
-            albums = album_controller.get_albums_by_genre(genre)
-            return {"albums": [album.to_dict() for album in albums]}, 200
+            albums = album_controller.get_albums_by_genre(
+                genre, limit=request.args.get("limit", SEARCH_LIMIT, type=int)
+            )
+            return [album.to_dict() for album in albums], 200
+        except ValueError as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": str(e)}, 500
+
+
+@album_ns.route("/cache/stats")
+class AlbumCacheStats(Resource):
+    @album_ns.doc("get_album_cache_stats")
+    @album_ns.response(200, "Success")
+    def get(self):
+        """Get album cache size and hit rate"""
+        return album_controller.get_cache_stats(), 200
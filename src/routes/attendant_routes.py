@@ -4,9 +4,11 @@ from src.controllers.attendant_controller import AttendantController
 from src.models.swagger_models import (
     attendant_model,
     attendant_input_model,
+    attendant_page_model,
     error_model,
     success_model,
 )
+from src.routes.marshalling import marshal_with_passthrough
 
 # Create namespace for attendants
 attendant_ns = Namespace("attendants", description="Attendant operations")
@@ -16,8 +18,12 @@ attendant_controller = AttendantController()
 @attendant_ns.route("")
 class AttendantList(Resource):
     @attendant_ns.doc("get_all_attendants")
-    @attendant_ns.marshal_list_with(attendant_model)
-    @attendant_ns.response(200, "Success", [attendant_model])
+    @attendant_ns.param("limit", "Maximum number of items per page")
+    @attendant_ns.param("cursor", "Cursor returned as next_cursor by the previous page")
+    @marshal_with_passthrough(attendant_ns, attendant_page_model)
+    @attendant_ns.response(200, "Success", attendant_page_model)
+    @attendant_ns.response(304, "Not Modified")
+    @attendant_ns.response(400, "Invalid pagination parameters", error_model)
     @attendant_ns.response(500, "Internal Server Error", error_model)
     def get(self):
         """Get all attendants"""
@@ -38,8 +44,9 @@ class AttendantList(Resource):
 @attendant_ns.param("attendant_id", "Attendant UUID")
 class Attendant(Resource):
     @attendant_ns.doc("get_attendant_by_id")
-    @attendant_ns.marshal_with(attendant_model)
+    @marshal_with_passthrough(attendant_ns, attendant_model)
     @attendant_ns.response(200, "Success", attendant_model)
+    @attendant_ns.response(304, "Not Modified")
     @attendant_ns.response(404, "Attendant not found", error_model)
     @attendant_ns.response(500, "Internal Server Error", error_model)
     def get(self, attendant_id):
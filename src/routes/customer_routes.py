@@ -4,9 +4,11 @@ from src.controllers.customer_controller import CustomerController
 from src.models.swagger_models import (
     customer_model,
     customer_input_model,
+    customer_page_model,
     error_model,
     success_model,
 )
+from src.routes.marshalling import marshal_with_passthrough
 
 # Create namespace for customers
 customer_ns = Namespace("customers", description="Customer operations")
@@ -16,8 +18,12 @@ customer_controller = CustomerController()
 @customer_ns.route("")
 class CustomerList(Resource):
     @customer_ns.doc("get_all_customers")
-    @customer_ns.marshal_list_with(customer_model)
-    @customer_ns.response(200, "Success", [customer_model])
+    @customer_ns.param("limit", "Maximum number of items per page")
+    @customer_ns.param("cursor", "Cursor returned as next_cursor by the previous page")
+    @marshal_with_passthrough(customer_ns, customer_page_model)
+    @customer_ns.response(200, "Success", customer_page_model)
+    @customer_ns.response(304, "Not Modified")
+    @customer_ns.response(400, "Invalid pagination parameters", error_model)
     @customer_ns.response(500, "Internal Server Error", error_model)
     def get(self):
         """Get all customers"""
@@ -38,8 +44,9 @@ class CustomerList(Resource):
 @customer_ns.param("customer_id", "Customer UUID")
 class Customer(Resource):
     @customer_ns.doc("get_customer_by_id")
-    @customer_ns.marshal_with(customer_model)
+    @marshal_with_passthrough(customer_ns, customer_model)
     @customer_ns.response(200, "Success", customer_model)
+    @customer_ns.response(304, "Not Modified")
     @customer_ns.response(404, "Customer not found", error_model)
     @customer_ns.response(500, "Internal Server Error", error_model)
     def get(self, customer_id):
@@ -1,12 +1,19 @@
 from flask_restx import Namespace, Resource
 from flask import request
+from src.cache.barcode_cache import normalize_barcode
+from src.controllers.base_controller import conditional
 from src.controllers.inventory_item_controller import InventoryItemController
 from src.models.swagger_models import (
     inventory_item_model,
     inventory_item_input_model,
+    inventory_item_bulk_input_model,
+    inventory_item_bulk_response_model,
+    inventory_item_scan_model,
+    inventory_item_page_model,
     error_model,
     success_model,
 )
+from src.routes.marshalling import marshal_with_passthrough
 
 # Create namespace for inventory items
 inventory_item_ns = Namespace(
@@ -18,16 +25,18 @@ inventory_item_controller = InventoryItemController()
 @inventory_item_ns.route("")
 class InventoryItemList(Resource):
     @inventory_item_ns.doc("get_all_inventory_items")
-    @inventory_item_ns.marshal_list_with(inventory_item_model)
-    @inventory_item_ns.response(200, "Success", [inventory_item_model])
+    @inventory_item_ns.param("limit", "Maximum number of items per page")
+    @inventory_item_ns.param(
+        "cursor", "Cursor returned as next_cursor by the previous page"
+    )
+    @marshal_with_passthrough(inventory_item_ns, inventory_item_page_model)
+    @inventory_item_ns.response(200, "Success", inventory_item_page_model)
+    @inventory_item_ns.response(304, "Not Modified")
+    @inventory_item_ns.response(400, "Invalid pagination parameters", error_model)
     @inventory_item_ns.response(500, "Internal Server Error", error_model)
     def get(self):
         """Get all inventory items"""
-        try:
-            items = inventory_item_controller.get_all_inventory_items()
-            return [item.to_dict() for item in items], 200
-        except Exception as e:
-            return {"error": str(e)}, 500
+        return inventory_item_controller.get_all()
 
     @inventory_item_ns.doc("create_inventory_item")
     @inventory_item_ns.expect(inventory_item_input_model)
@@ -56,12 +65,49 @@ class InventoryItemList(Resource):
             return {"error": str(e)}, 500
 
 
+@inventory_item_ns.route("/bulk")
+class InventoryItemBulk(Resource):
+    @inventory_item_ns.doc("bulk_create_inventory_items")
+    @inventory_item_ns.expect(inventory_item_bulk_input_model)
+    @inventory_item_ns.response(
+        201, "All items created", inventory_item_bulk_response_model
+    )
+    @inventory_item_ns.response(
+        207, "Some items rejected", inventory_item_bulk_response_model
+    )
+    @inventory_item_ns.response(
+        400, "No items created", inventory_item_bulk_response_model
+    )
+    @inventory_item_ns.response(500, "Internal Server Error", error_model)
+    def post(self):
+        """Create a batch of inventory items"""
+        try:
+            data = request.get_json()
+            if not data:
+                return {"error": "No data provided"}, 400
+
+            results = inventory_item_controller.bulk_create_inventory_items(
+                data.get("items")
+            )
+            created = sum(1 for result in results if result["status"] == "created")
+            failed = len(results) - created
+            body = {"created": created, "failed": failed, "results": results}
+            if not created:
+                return body, 400
+            return body, 207 if failed else 201
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+
 @inventory_item_ns.route("/<uuid:item_id>")
 @inventory_item_ns.param("item_id", "Inventory Item UUID")
 class InventoryItem(Resource):
     @inventory_item_ns.doc("get_inventory_item_by_id")
-    @inventory_item_ns.marshal_with(inventory_item_model)
+    @marshal_with_passthrough(inventory_item_ns, inventory_item_model)
     @inventory_item_ns.response(200, "Success", inventory_item_model)
+    @inventory_item_ns.response(304, "Not Modified")
     @inventory_item_ns.response(404, "Inventory item not found", error_model)
     @inventory_item_ns.response(500, "Internal Server Error", error_model)
     def get(self, item_id):
@@ -120,15 +166,21 @@ class InventoryItem(Resource):
 @inventory_item_ns.param("barcode", "Item barcode")
 class InventoryItemByBarcode(Resource):
     @inventory_item_ns.doc("get_inventory_item_by_barcode")
-    @inventory_item_ns.marshal_with(inventory_item_model)
-    @inventory_item_ns.response(200, "Success", inventory_item_model)
+    @inventory_item_ns.marshal_with(inventory_item_scan_model)
+    @inventory_item_ns.response(200, "Success", inventory_item_scan_model)
     @inventory_item_ns.response(404, "Inventory item not found", error_model)
     @inventory_item_ns.response(500, "Internal Server Error", error_model)
     def get(self, barcode):
         """Get inventory item by barcode"""
         try:
             item = inventory_item_controller.get_inventory_item_by_barcode(barcode)
-            return item.to_dict(), 200
+            return {
+                "id": str(item.id),
+                "barcode": normalize_barcode(barcode),
+                "album_id": str(item.album_id),
+                "store_id": str(item.store_id),
+                "status": item.status,
+            }, 200
         except ValueError as e:
             return {"error": str(e)}, 404
         except Exception as e:
@@ -139,14 +191,20 @@ class InventoryItemByBarcode(Resource):
 @inventory_item_ns.param("store_id", "Store UUID")
 class InventoryItemsByStore(Resource):
     @inventory_item_ns.doc("get_inventory_items_by_store")
-    @inventory_item_ns.marshal_list_with(inventory_item_model)
+    @marshal_with_passthrough(inventory_item_ns, inventory_item_model, as_list=True)
     @inventory_item_ns.response(200, "Success", [inventory_item_model])
+    @inventory_item_ns.response(304, "Not Modified")
     @inventory_item_ns.response(500, "Internal Server Error", error_model)
     def get(self, store_id):
         """Get inventory items by store"""
         try:
-            items = inventory_item_controller.get_inventory_items_by_store(store_id)
-            return [item.to_dict() for item in items], 200
+            etag = inventory_item_controller.get_store_inventory_etag(store_id)
+
+            def build():
+                items = inventory_item_controller.get_inventory_items_by_store(store_id)
+                return [item.to_dict() for item in items]
+
+            return conditional(etag, build, weak=True)
         except Exception as e:
             return {"error": str(e)}, 500
 
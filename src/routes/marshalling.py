@@ -0,0 +1,39 @@
+from functools import wraps
+
+from flask import Response
+from flask_restx.api import HTTPStatus
+from flask_restx.utils import merge
+
+
+def is_error(resp):
+    """True for a ``(body, status)`` or ``(body, status, headers)`` error tuple"""
+    return isinstance(resp, tuple) and len(resp) > 1 and int(resp[1]) >= 400
+
+
+def marshal_with_passthrough(namespace, model, as_list=False, code=HTTPStatus.OK):
+    """Like ``namespace.marshal_with`` but returns Flask responses untouched.
+
+    Lets a resource answer with a ready-made response (a stream, a 304) while
+    keeping the model in the Swagger documentation. Error tuples, with a
+    status of 400 or more, are returned as they are so their ``error`` body
+    is not replaced by an empty model.
+    """
+
+    def decorator(func):
+        marshal = namespace.marshal_with(model, as_list=as_list, code=code)(
+            lambda resp: resp
+        )
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            resp = func(*args, **kwargs)
+            if isinstance(resp, Response) or is_error(resp):
+                return resp
+            return marshal(resp)
+
+        wrapper.__apidoc__ = merge(
+            getattr(func, "__apidoc__", {}), marshal.__apidoc__
+        )
+        return wrapper
+
+    return decorator
@@ -0,0 +1,20 @@
+from flask import Response
+from flask_restx import Namespace, Resource
+from src.config.database import db
+from src.config.metrics import pool_gauges, registry, render
+
+# Create namespace for Prometheus metrics
+metrics_ns = Namespace("metrics", description="Prometheus metrics")
+
+PROMETHEUS_MIMETYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@metrics_ns.route("")
+class Metrics(Resource):
+    @metrics_ns.doc("get_metrics")
+    @metrics_ns.produces(["text/plain"])
+    @metrics_ns.response(200, "Metrics in the Prometheus text format")
+    def get(self):
+        """Get request latency, status codes and pool usage of all workers"""
+        merged = registry.collect(pool_gauges(db.engines))
+        return Response(render(merged), content_type=PROMETHEUS_MIMETYPE)
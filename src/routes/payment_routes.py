@@ -1,9 +1,12 @@
 from flask_restx import Namespace, Resource
 from flask_restx.api import HTTPStatus
 from src.controllers.payment_controller import PaymentController
+from src.routes.marshalling import marshal_with_passthrough
 from src.models.swagger_models import (
     payment_model,
     payment_input_model,
+    payment_page_model,
+    payment_report_model,
     error_model,
     success_model,
 )
@@ -16,8 +19,12 @@ payment_controller = PaymentController()
 @payment_ns.route("")
 class PaymentList(Resource):
     @payment_ns.doc("get_all_payments")
-    @payment_ns.marshal_list_with(payment_model)
-    @payment_ns.response(200, "Success", [payment_model])
+    @payment_ns.param("limit", "Maximum number of items per page")
+    @payment_ns.param("cursor", "Cursor returned as next_cursor by the previous page")
+    @marshal_with_passthrough(payment_ns, payment_page_model)
+    @payment_ns.response(200, "Success", payment_page_model)
+    @payment_ns.response(304, "Not Modified")
+    @payment_ns.response(400, "Invalid pagination parameters", error_model)
     @payment_ns.response(500, "Internal Server Error", error_model)
     def get(self):
         """Get all payments"""
@@ -38,8 +45,9 @@ class PaymentList(Resource):
 @payment_ns.param("payment_id", "Payment UUID")
 class Payment(Resource):
     @payment_ns.doc("get_payment_by_id")
-    @payment_ns.marshal_with(payment_model)
+    @marshal_with_passthrough(payment_ns, payment_model)
     @payment_ns.response(200, "Success", payment_model)
+    @payment_ns.response(304, "Not Modified")
     @payment_ns.response(404, "Payment not found", error_model)
     @payment_ns.response(500, "Internal Server Error", error_model)
     def get(self, payment_id):
@@ -98,11 +106,12 @@ class FailPayment(Resource):
 @payment_ns.param("status", "Payment status")
 class PaymentsByStatus(Resource):
     @payment_ns.doc("get_payments_by_status")
-    @payment_ns.marshal_list_with(payment_model)
+    @payment_ns.produces(["application/json", "application/x-ndjson"])
+    @marshal_with_passthrough(payment_ns, payment_model, as_list=True)
     @payment_ns.response(200, "Success", [payment_model])
     @payment_ns.response(500, "Internal Server Error", error_model)
     def get(self, status):
-        """Get payments by status"""
+        """Get payments by status, streamed as NDJSON when requested via Accept"""
         return payment_controller.get_payments_by_status(status)
 
 
@@ -110,9 +119,31 @@ class PaymentsByStatus(Resource):
 @payment_ns.param("method", "Payment method")
 class PaymentsByMethod(Resource):
     @payment_ns.doc("get_payments_by_method")
-    @payment_ns.marshal_list_with(payment_model)
+    @payment_ns.produces(["application/json", "application/x-ndjson"])
+    @marshal_with_passthrough(payment_ns, payment_model, as_list=True)
     @payment_ns.response(200, "Success", [payment_model])
     @payment_ns.response(500, "Internal Server Error", error_model)
     def get(self, method):
-        """Get payments by payment method"""
+        """Get payments by payment method, streamed as NDJSON when requested via Accept"""
         return payment_controller.get_payments_by_method(method)
+
+
+@payment_ns.route("/reports")
+class PaymentReport(Resource):
+    @payment_ns.doc("get_payment_report")
+    @payment_ns.param(
+        "group_by",
+        "Comma separated: one of day, week or month, plus store, method, status "
+        "(default month)",
+    )
+    @payment_ns.param("from", "Include payments on or after this ISO date")
+    @payment_ns.param("to", "Include payments before this ISO date")
+    @payment_ns.param("store_id", "Only payments for items of this store")
+    @payment_ns.param("status", "Only payments with this status")
+    @payment_ns.param("method", "Only payments with this method")
+    @payment_ns.response(200, "Success", payment_report_model)
+    @payment_ns.response(400, "Invalid report parameters", error_model)
+    @payment_ns.response(500, "Internal Server Error", error_model)
+    def get(self):
+        """Get payment count and revenue, aggregated in the database"""
+        return payment_controller.get_revenue_report()
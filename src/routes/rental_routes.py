@@ -1,9 +1,12 @@
 from flask_restx import Namespace, Resource
 from flask_restx.api import HTTPStatus
 from src.controllers.rental_controller import RentalController
+from src.routes.marshalling import marshal_with_passthrough
 from src.models.swagger_models import (
     rental_model,
     rental_input_model,
+    rental_page_model,
+    overdue_rental_page_model,
     error_model,
     success_model,
 )
@@ -16,8 +19,12 @@ rental_controller = RentalController()
 @rental_ns.route("")
 class RentalList(Resource):
     @rental_ns.doc("get_all_rentals")
-    @rental_ns.marshal_list_with(rental_model)
-    @rental_ns.response(200, "Success", [rental_model])
+    @rental_ns.param("limit", "Maximum number of items per page")
+    @rental_ns.param("cursor", "Cursor returned as next_cursor by the previous page")
+    @marshal_with_passthrough(rental_ns, rental_page_model)
+    @rental_ns.response(200, "Success", rental_page_model)
+    @rental_ns.response(304, "Not Modified")
+    @rental_ns.response(400, "Invalid pagination parameters", error_model)
     @rental_ns.response(500, "Internal Server Error", error_model)
     def get(self):
         """Get all rentals"""
@@ -25,9 +32,10 @@ class RentalList(Resource):
 
     @rental_ns.doc("create_rental")
     @rental_ns.expect(rental_input_model)
-    @rental_ns.marshal_with(rental_model, code=HTTPStatus.CREATED)
+    @marshal_with_passthrough(rental_ns, rental_model, code=HTTPStatus.CREATED)
     @rental_ns.response(201, "Rental created successfully", rental_model)
     @rental_ns.response(400, "Invalid input", error_model)
+    @rental_ns.response(409, "Inventory item is not available", error_model)
     @rental_ns.response(500, "Internal Server Error", error_model)
     def post(self):
         """Create a new rental"""
@@ -38,8 +46,9 @@ class RentalList(Resource):
 @rental_ns.param("rental_id", "Rental UUID")
 class Rental(Resource):
     @rental_ns.doc("get_rental_by_id")
-    @rental_ns.marshal_with(rental_model)
+    @marshal_with_passthrough(rental_ns, rental_model)
     @rental_ns.response(200, "Success", rental_model)
+    @rental_ns.response(304, "Not Modified")
     @rental_ns.response(404, "Rental not found", error_model)
     @rental_ns.response(500, "Internal Server Error", error_model)
     def get(self, rental_id):
@@ -48,7 +57,7 @@ class Rental(Resource):
 
     @rental_ns.doc("update_rental")
     @rental_ns.expect(rental_input_model)
-    @rental_ns.marshal_with(rental_model)
+    @marshal_with_passthrough(rental_ns, rental_model)
     @rental_ns.response(200, "Rental updated successfully", rental_model)
     @rental_ns.response(404, "Rental not found", error_model)
     @rental_ns.response(400, "Invalid input", error_model)
@@ -70,7 +79,7 @@ class Rental(Resource):
 @rental_ns.param("rental_id", "Rental UUID")
 class ReturnRental(Resource):
     @rental_ns.doc("return_rental")
-    @rental_ns.marshal_with(rental_model)
+    @marshal_with_passthrough(rental_ns, rental_model)
     @rental_ns.response(200, "Rental returned successfully", rental_model)
     @rental_ns.response(404, "Rental not found", error_model)
     @rental_ns.response(400, "Invalid request", error_model)
@@ -83,20 +92,38 @@ class ReturnRental(Resource):
 @rental_ns.route("/active")
 class ActiveRentals(Resource):
     @rental_ns.doc("get_active_rentals")
-    @rental_ns.marshal_list_with(rental_model)
+    @rental_ns.produces(["application/json", "application/x-ndjson"])
+    @marshal_with_passthrough(rental_ns, rental_model, as_list=True)
     @rental_ns.response(200, "Success", [rental_model])
     @rental_ns.response(500, "Internal Server Error", error_model)
     def get(self):
-        """Get all active rentals"""
+        """Get all active rentals, streamed as NDJSON when requested via Accept"""
         return rental_controller.get_active_rentals()
 
 
 @rental_ns.route("/returned")
 class ReturnedRentals(Resource):
     @rental_ns.doc("get_returned_rentals")
-    @rental_ns.marshal_list_with(rental_model)
+    @rental_ns.produces(["application/json", "application/x-ndjson"])
+    @marshal_with_passthrough(rental_ns, rental_model, as_list=True)
     @rental_ns.response(200, "Success", [rental_model])
     @rental_ns.response(500, "Internal Server Error", error_model)
     def get(self):
-        """Get all returned rentals"""
+        """Get all returned rentals, streamed as NDJSON when requested via Accept"""
         return rental_controller.get_returned_rentals()
+
+
+@rental_ns.route("/overdue")
+class OverdueRentals(Resource):
+    @rental_ns.doc("get_overdue_rentals")
+    @rental_ns.param("days", "Rented more than this many days ago (default 7)")
+    @rental_ns.param("store_id", "Only rentals of items from this store")
+    @rental_ns.param("limit", "Maximum number of items per page")
+    @rental_ns.param("cursor", "Cursor returned as next_cursor by the previous page")
+    @marshal_with_passthrough(rental_ns, overdue_rental_page_model)
+    @rental_ns.response(200, "Success", overdue_rental_page_model)
+    @rental_ns.response(400, "Invalid parameters", error_model)
+    @rental_ns.response(500, "Internal Server Error", error_model)
+    def get(self):
+        """Get open rentals past due, oldest first"""
+        return rental_controller.get_overdue_rentals()
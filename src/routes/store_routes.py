@@ -4,9 +4,11 @@ from src.controllers.store_controller import StoreController
 from src.models.swagger_models import (
     store_model,
     store_input_model,
+    store_page_model,
     error_model,
     success_model,
 )
+from src.routes.marshalling import marshal_with_passthrough
 
 # Create namespace for stores
 store_ns = Namespace("stores", description="Store operations")
@@ -16,8 +18,12 @@ store_controller = StoreController()
 @store_ns.route("")
 class StoreList(Resource):
     @store_ns.doc("get_all_stores")
-    @store_ns.marshal_list_with(store_model)
-    @store_ns.response(200, "Success", [store_model])
+    @store_ns.param("limit", "Maximum number of items per page")
+    @store_ns.param("cursor", "Cursor returned as next_cursor by the previous page")
+    @marshal_with_passthrough(store_ns, store_page_model)
+    @store_ns.response(200, "Success", store_page_model)
+    @store_ns.response(304, "Not Modified")
+    @store_ns.response(400, "Invalid pagination parameters", error_model)
     @store_ns.response(500, "Internal Server Error", error_model)
     def get(self):
         """Get all stores"""
@@ -38,8 +44,9 @@ class StoreList(Resource):
 @store_ns.param("store_id", "Store UUID")
 class Store(Resource):
     @store_ns.doc("get_store_by_id")
-    @store_ns.marshal_with(store_model)
+    @marshal_with_passthrough(store_ns, store_model)
     @store_ns.response(200, "Success", store_model)
+    @store_ns.response(304, "Not Modified")
     @store_ns.response(404, "Store not found", error_model)
     @store_ns.response(500, "Internal Server Error", error_model)
     def get(self, store_id):
@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from src.cache import album_cache, barcode_cache
+from src.config.database import db
+
+
+@pytest.fixture(scope="session")
+def app():
+    return create_app("test", {"SQLALCHEMY_DATABASE_URI": "sqlite://"})
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def database(app):
+    """Give every test empty tables and empty caches"""
+    with app.app_context():
+        db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)
+        album_cache.clear()
+        barcode_cache.clear()
+        yield db
+        db.session.remove()
+
+
+@pytest.fixture
+def count_statements(app):
+    """Context manager collecting every SQL statement sent to the database"""
+
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return counting
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from sqlalchemy import update
+
+from src.cache import album_cache, barcode_cache, invalidation
+from src.cache.invalidation import MAX_PAYLOAD_BYTES, _chunks
+from src.config.database import db
+from src.models import Album, InventoryItem, Store
+
+
+@pytest.fixture
+def album():
+    album = Album(title="Kind of Blue", rental_price=10, artist="Miles Davis", genre="Jazz")
+    db.session.add(album)
+    db.session.commit()
+    return album.id
+
+
+def _reprice_elsewhere(album_id, price):
+    # A Core update skips this process's flush listeners, like a commit made
+    # by another worker
+    db.session.execute(update(Album).where(Album.id == album_id).values(rental_price=price))
+    db.session.commit()
+
+
+def test_notification_drops_the_album_and_catalog(album):
+    assert album_cache.get(album)["rental_price"] == 10.0
+    assert album_cache.get_catalog().items[0]["rental_price"] == 10.0
+
+    _reprice_elsewhere(album, 12)
+    assert album_cache.get(album)["rental_price"] == 10.0
+    invalidation.dispatch(json.dumps({"cache": "albums", "keys": [str(album)]}))
+
+    assert album_cache.get(album)["rental_price"] == 12.0
+    assert album_cache.get_catalog().items[0]["rental_price"] == 12.0
+
+
+def test_foreign_payloads_are_ignored(album):
+    album_cache.get(album)
+    invalidation.dispatch("not json")
+    invalidation.dispatch(json.dumps({"cache": "unknown", "keys": [str(album)]}))
+    assert album_cache.stats()["albums"]["size"] == 1
+
+
+def test_reads_go_through_while_not_listening(album):
+    album_cache.get(album)
+    invalidation.listening = True
+    try:
+        assert not invalidation.coherent
+        _reprice_elsewhere(album, 12)
+        assert album_cache.get(album)["rental_price"] == 12.0
+        assert album_cache.get_catalog() is None
+    finally:
+        invalidation.listening = False
+
+
+def test_notification_refreshes_a_scanned_status(album):
+    store = Store(cnpj="11222333000181", trade_name="Main Store")
+    db.session.add(store)
+    db.session.flush()
+    db.session.add(InventoryItem("SCAN-0001", album, store.id, "available"))
+    db.session.commit()
+    assert barcode_cache.get("scan-0001").status == "available"
+
+    db.session.execute(
+        update(InventoryItem)
+        .where(InventoryItem.barcode == "SCAN-0001")
+        .values(status="rented")
+    )
+    db.session.commit()
+    assert barcode_cache.get("SCAN-0001").status == "available"
+
+    invalidation.dispatch(json.dumps({"cache": "barcodes", "keys": ["SCAN-0001"]}))
+    assert barcode_cache.get("SCAN-0001").status == "rented"
+
+
+def test_long_barcodes_are_split_across_notifications():
+    keys = [f"{index:04d}" + "X" * 196 for index in range(200)]
+    chunks = list(_chunks("barcodes", keys))
+
+    assert [key for chunk in chunks for key in chunk] == keys
+    for chunk in chunks:
+        payload = json.dumps({"cache": "barcodes", "keys": chunk})
+        assert len(payload.encode()) <= MAX_PAYLOAD_BYTES
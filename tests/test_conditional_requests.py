@@ -0,0 +1,55 @@
+from src.cache import album_cache
+from src.config.database import db
+from src.models import Store
+
+
+def _store(index):
+    store = Store(cnpj=f"1{index:013d}", trade_name=f"Store {index}")
+    db.session.add(store)
+    db.session.commit()
+    return store
+
+
+def _get(client, path, etag):
+    return client.get(path, headers={"If-None-Match": etag})
+
+
+def test_list_page_tag_follows_the_rows_on_the_page(client):
+    first, second = _store(1), _store(2)
+    etag = client.get("/api/stores?limit=1").headers["ETag"]
+    assert _get(client, "/api/stores?limit=1", etag).status_code == 304
+
+    # Only the first store is on the page
+    second.trade_name = "Renamed Second"
+    db.session.commit()
+    assert _get(client, "/api/stores?limit=1", etag).status_code == 304
+
+    first.trade_name = "Renamed First"
+    db.session.commit()
+    response = _get(client, "/api/stores?limit=1", etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_album_list_tag_is_the_same_with_and_without_the_catalog(app, client):
+    response = client.post("/api/albums", json={
+        "title": "Kind of Blue",
+        "artist": "Miles Davis",
+        "genre": "Jazz",
+        "rental_price": 10,
+    })
+    assert response.status_code == 201
+    cached = client.get("/api/albums").headers["ETag"]
+
+    # A catalog over max_rows is not held, the page is read from the database
+    config = app.config
+    album_cache.configure(config["ALBUM_CACHE_SIZE"], config["ALBUM_CACHE_TTL_SECONDS"], 0)
+    try:
+        album_cache.clear()
+        assert client.get("/api/albums").headers["ETag"] == cached
+    finally:
+        album_cache.configure(
+            config["ALBUM_CACHE_SIZE"],
+            config["ALBUM_CACHE_TTL_SECONDS"],
+            config["ALBUM_CATALOG_MAX_ROWS"],
+        )
@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/api/albums", "/api/stores", "/api/rentals"])
+@pytest.mark.parametrize("query", ["limit=abc", "limit=0", "cursor=not-a-cursor"])
+def test_invalid_page_arguments_return_the_error(client, path, query):
+    response = client.get(f"{path}?{query}")
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["error"] == "Invalid pagination parameters"
+    assert body["details"]
+    assert "items" not in body
@@ -0,0 +1,190 @@
+"""Query plans of the read routes over a large PostgreSQL dataset.
+
+Set TEST_POSTGRES_URL to run the plan checks. An empty database is filled with
+benchmarks.generate_data first, a populated one is used as it is.
+"""
+
+import os
+import random
+import re
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, text
+
+from app import create_app
+from benchmarks import generate_data
+from benchmarks.scenarios import SCENARIOS, Request, discover
+from src.config.api import api
+from src.config.database import db
+from src.models import Person, Store
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+requires_postgres = pytest.mark.skipif(
+    not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set"
+)
+
+# Enough rows that the planner prefers an index for a selective query
+FIXTURE_ARGS = [
+    "--stores", "50",
+    "--attendants-per-store", "2",
+    "--customers", "60000",
+    "--albums", "20000",
+    "--copies", "3",
+    "--years", "1",
+    "--rental-gap-days", "60",
+]
+# Tables at least this large must never be read with a sequential scan
+LARGE_TABLE_ROWS = 50_000
+
+# Not controller queries
+NOT_CHECKED = {"GET /swagger.json"}
+# Unpaginated and unfiltered: nearly every returned rental, and a quarter of
+# the payments on average, so reading the whole table is the right plan
+WHOLE_TABLE_READS = {"GET /rentals/returned", "GET /payments/method/<method>"}
+
+ROUTES = {
+    request.endpoint: request
+    for request in SCENARIOS.values()
+    if isinstance(request, Request) and request.method == "GET"
+}
+# The benchmark reads these over the whole table; check their filters instead
+del ROUTES["GET /inventory-items/available"], ROUTES["GET /payments/reports"]
+ROUTES.update({
+    "GET /inventory-items/available (store)": Request(
+        "GET /inventory-items/available",
+        lambda f, rng: f"/inventory-items/available?store_id={f.pick(rng, 'stores')}",
+    ),
+    "GET /inventory-items/available (album)": Request(
+        "GET /inventory-items/available",
+        lambda f, rng: f"/inventory-items/available?album_id={f.pick(rng, 'albums')}",
+    ),
+    "GET /payments/reports (store)": Request(
+        "GET /payments/reports",
+        lambda f, rng: "/payments/reports?group_by=month,method&store_id="
+        + f.pick(rng, "stores"),
+    ),
+    "GET /payments/reports (last week)": Request(
+        "GET /payments/reports",
+        lambda f, rng: "/payments/reports?group_by=week,method&from="
+        + (date.today() - timedelta(days=7)).isoformat(),
+    ),
+    "GET /rentals/overdue (store)": Request(
+        "GET /rentals/overdue",
+        lambda f, rng: f"/rentals/overdue?store_id={f.pick(rng, 'stores')}",
+    ),
+})
+# Controller reads no benchmark scenario calls, with their rarest values
+for request in [
+    Request(
+        "GET /inventory-items/album/<id>",
+        lambda f, rng: f"/inventory-items/album/{f.pick(rng, 'albums')}",
+    ),
+    Request(
+        "GET /inventory-items/status/<status>",
+        lambda f, rng: "/inventory-items/status/damaged",
+    ),
+    Request("GET /payments/status/<status>", lambda f, rng: "/payments/status/refunded"),
+    Request("GET /albums/cache/stats", lambda f, rng: "/albums/cache/stats"),
+    Request("GET /admin/slow-queries", lambda f, rng: "/admin/slow-queries"),
+]:
+    ROUTES[request.endpoint] = request
+
+
+def route_pattern(endpoint):
+    """``endpoint`` with its placeholders blanked, to compare with URL rules"""
+    return re.sub(r"<[^>]*>", "<>", endpoint)
+
+
+def test_every_read_route_is_checked(app):
+    checked = {route_pattern(request.endpoint) for request in ROUTES.values()}
+    checked |= {route_pattern(endpoint) for endpoint in NOT_CHECKED | WHOLE_TABLE_READS}
+    prefix = f"{api.prefix}/"
+    missing = sorted(
+        rule.rule
+        for rule in app.url_map.iter_rules()
+        if "GET" in rule.methods
+        and rule.rule.startswith(prefix)
+        and route_pattern(f"GET /{rule.rule[len(prefix):]}") not in checked
+    )
+    assert not missing, f"No query plan check for: {', '.join(missing)}"
+
+
+@pytest.fixture(scope="module")
+def postgres_app():
+    app = create_app("test", {"SQLALCHEMY_DATABASE_URI": POSTGRES_URL})
+    with app.app_context():
+        empty = not (
+            db.session.query(Person.id).first() or db.session.query(Store.id).first()
+        )
+        db.session.remove()
+
+    if empty:
+        args = generate_data.parse_args(FIXTURE_ARGS)
+        generate_data.generate(app, generate_data.Plan(args), args.workers)
+        generate_data.finish(app)
+    else:
+        with app.app_context(), db.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as connection:
+            connection.execute(text("ANALYZE"))
+    return app
+
+
+@pytest.fixture(scope="module")
+def large_tables(postgres_app):
+    with postgres_app.app_context(), db.engine.connect() as connection:
+        return set(
+            connection.execute(
+                text(
+                    "SELECT relname FROM pg_class "
+                    "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace "
+                    "AND reltuples >= :rows"
+                ),
+                {"rows": LARGE_TABLE_ROWS},
+            ).scalars()
+        )
+
+
+@pytest.fixture(scope="module")
+def fixtures(postgres_app):
+    return discover(postgres_app.test_client(), "/api")
+
+
+def sequential_scans(plan, tables):
+    """Relations in ``tables`` read by a Seq Scan node anywhere in ``plan``"""
+    scans = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in tables:
+        scans.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        scans.extend(sequential_scans(child, tables))
+    return scans
+
+
+@requires_postgres
+@pytest.mark.parametrize("route", sorted(ROUTES))
+def test_route_avoids_sequential_scans(postgres_app, large_tables, fixtures, route):
+    path = ROUTES[route].build(fixtures, random.Random(route))
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    with postgres_app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = postgres_app.test_client().get(f"/api{path}")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+    with postgres_app.app_context(), engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            ).scalar()
+            scans = sequential_scans(plan[0]["Plan"], large_tables)
+            assert not scans, f"Seq Scan on {', '.join(scans)} for:\n{statement}"
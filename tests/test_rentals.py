@@ -0,0 +1,56 @@
+import pytest
+
+
+def _post(client, path, payload):
+    response = client.post(path, json=payload)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()
+
+
+@pytest.fixture
+def checkout(client):
+    """Ids of a customer, an attendant and an available item"""
+    store = _post(client, "/api/stores", {"cnpj": "11222333000181", "trade_name": "Main Store"})
+    attendant = _post(client, "/api/attendants", {
+        "cpf": "52998224725",
+        "name": "Ana Souza",
+        "phone": "85991234567",
+        "email": "ana@store.example.com",
+        "store_id": store["id"],
+    })
+    customer = _post(client, "/api/customers", {
+        "cpf": "11144477735",
+        "name": "Bruno Lima",
+        "phone": "85998765432",
+        "email": "bruno@example.com",
+    })
+    album = _post(client, "/api/albums", {
+        "title": "Kind of Blue", "artist": "Miles Davis", "genre": "Jazz", "rental_price": 10,
+    })
+    item = _post(client, "/api/inventory-items", {
+        "barcode": "RENT-0001", "album_id": album["id"], "store_id": store["id"],
+    })
+    return {
+        "customer_id": customer["id"],
+        "attendant_id": attendant["id"],
+        "item_id": item["id"],
+    }
+
+
+def test_second_checkout_of_an_item_is_a_conflict(client, checkout):
+    rental = client.post("/api/rentals", json=checkout)
+    assert rental.status_code == 201
+    assert rental.get_json()["item_id"] == checkout["item_id"]
+
+    again = client.post("/api/rentals", json=checkout)
+    assert again.status_code == 409
+    assert again.get_json() == {"error": "Inventory item is not available for rental"}
+
+
+def test_returning_a_returned_rental_reports_the_error(client, checkout):
+    rental = client.post("/api/rentals", json=checkout).get_json()
+    assert client.post(f"/api/rentals/{rental['id']}/return").status_code == 200
+
+    again = client.post(f"/api/rentals/{rental['id']}/return")
+    assert again.status_code == 400
+    assert again.get_json()["error"]
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import event, select, text, update
+
+from src.config.database import db
+from src.config.slow_queries import calling_controller, is_plain_read
+from src.models import Album, Rental
+
+
+@pytest.fixture
+def executed():
+    """(statement, context) of the last statement sent to the database"""
+    last = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        last["statement"], last["context"] = statement, context
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield lambda: (last["statement"], last["context"])
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_plain_selects_are_explained(executed):
+    db.session.execute(select(Album.id).where(Album.genre == "Jazz"))
+    assert is_plain_read(*executed())
+
+    Rental.query.filter(Rental.return_date.is_(None)).all()
+    assert is_plain_read(*executed())
+
+    db.session.execute(text("SELECT count(*) FROM albums"))
+    assert is_plain_read(*executed())
+
+
+def test_locking_selects_are_not_explained(executed):
+    Rental.query.filter(Rental.return_date.is_(None)).with_for_update().all()
+    statement, context = executed()
+    assert not is_plain_read(statement, context)
+    # Even when the dialect leaves the locking clause out of the SQL
+    assert not is_plain_read("SELECT rentals.id FROM rentals", context)
+
+
+def test_writes_are_not_explained(executed):
+    db.session.execute(update(Album).where(Album.genre == "Jazz").values(genre="Blues"))
+    assert not is_plain_read(*executed())
+    db.session.rollback()
+
+
+@pytest.mark.parametrize("statement", [
+    "SELECT id FROM rentals WHERE return_date IS NULL FOR UPDATE",
+    "SELECT id FROM rentals FOR NO KEY UPDATE",
+    "SELECT id FROM rentals FOR KEY SHARE",
+    "select id from rentals for share",
+    "WITH moved AS (DELETE FROM rentals RETURNING id) SELECT count(*) FROM moved",
+    "WITH added AS (INSERT INTO albums DEFAULT VALUES RETURNING id) SELECT * FROM added",
+    "EXPLAIN SELECT 1",
+])
+def test_raw_sql_that_locks_or_writes_is_not_explained(statement):
+    assert not is_plain_read(statement, None)
+
+
+def test_columns_named_like_keywords_are_fine():
+    assert is_plain_read("SELECT updated_at, deleted_flag FROM albums", None)
+
+
+def test_controller_functions_without_self_are_named():
+    # Like a staticmethod or a closure defined in a controller module
+    namespace = {"__name__": "src.controllers.example", "calling_controller": calling_controller}
+    exec("def transition_status():\n    return calling_controller()", namespace)
+
+    assert namespace["transition_status"]().endswith("transition_status")
@@ -0,0 +1,107 @@
+import pytest
+
+from src.config.database import db
+from src.models import Address, Attendant, Customer, Person, Store
+
+# Statements per request, whatever the number of rows
+LIST_STATEMENTS = 1
+GET_STATEMENTS = 1
+
+
+def _person(index):
+    person = Person(
+        cpf=f"1{index:010d}",
+        name=f"Person {index}",
+        phone=f"859{index:08d}",
+        email=f"person{index}@example.com",
+    )
+    db.session.add(person)
+    db.session.flush()
+    return person
+
+
+def _store(index):
+    store = Store(cnpj=f"1{index:013d}", trade_name=f"Store {index}")
+    db.session.add(store)
+    db.session.flush()
+    return store
+
+
+def seed_customers(count):
+    ids = []
+    for index in range(count):
+        customer = Customer(person_id=_person(index).id)
+        db.session.add(customer)
+        ids.append(customer.person_id)
+    db.session.commit()
+    return ids
+
+
+def seed_attendants(count):
+    store = _store(0)
+    ids = []
+    for index in range(count):
+        attendant = Attendant(person_id=_person(index).id, store_id=store.id)
+        db.session.add(attendant)
+        ids.append(attendant.person_id)
+    db.session.commit()
+    return ids
+
+
+def seed_stores(count):
+    ids = [_store(index).id for index in range(count)]
+    db.session.commit()
+    return ids
+
+
+def seed_addresses(count):
+    ids = []
+    for index in range(count):
+        address = Address(
+            street=f"Rua {index}",
+            number=str(index + 1),
+            neighborhood="Centro",
+            city="Fortaleza",
+            state="CE",
+            zip_code="60160000",
+            store_id=_store(index).id,
+        )
+        db.session.add(address)
+        db.session.flush()
+        ids.append(address.id)
+    db.session.commit()
+    return ids
+
+
+RESOURCES = [
+    ("/api/customers", seed_customers),
+    ("/api/attendants", seed_attendants),
+    ("/api/addresses", seed_addresses),
+    ("/api/stores", seed_stores),
+]
+
+
+@pytest.mark.parametrize("rows", [1, 25])
+@pytest.mark.parametrize("path, seed", RESOURCES)
+def test_list_statement_count(client, count_statements, path, seed, rows):
+    seed(rows)
+
+    with count_statements() as statements:
+        response = client.get(path)
+
+    assert response.status_code == 200
+    assert len(response.get_json()["items"]) == rows
+    assert len(statements) == LIST_STATEMENTS, statements
+
+
+@pytest.mark.parametrize("rows", [1, 25])
+@pytest.mark.parametrize("path, seed", RESOURCES)
+def test_get_by_id_statement_count(client, count_statements, path, seed, rows):
+    record_id = seed(rows)[-1]
+
+    with count_statements() as statements:
+        response = client.get(f"{path}/{record_id}")
+
+    assert response.status_code == 200
+    assert response.get_json()["id"] == str(record_id)
+    assert len(statements) == GET_STATEMENTS, statements